@@ -0,0 +1,198 @@
+"""
+SYSC 2100 Winter 2023
+Lab 1, Analysis cache
+Caches the results of build_histogram and build_word_list, so that calling
+them again on a file that hasn't changed costs a stat() instead of reading
+and tokenizing the whole file.
+"""
+
+__author__ = 'Rama Alkhouli'
+
+import hashlib
+import os
+import pickle
+import tempfile
+import time
+from collections import OrderedDict
+
+from build_word_list import build_word_list
+from tokenizer import DEFAULT_TOKENIZER, Tokenizer
+from word_histogram import build_histogram
+
+
+class AnalysisCache:
+    """A cache of LAB1 analysis results.
+
+    A result is identified by the analysis function, the file's absolute
+    path, size and modification time, and the tokenizer's settings. If a
+    file is modified, its size or modification time changes, so its stale
+    results are never returned.
+
+    Up to max_entries results are kept in memory, and the least recently
+    used result is discarded when the cache is full. If cache_dir is not
+    None, results are also pickled to files in that directory, so they
+    survive between runs; the least recently used files are deleted when the
+    files' total size exceeds max_disk_bytes.
+
+    Results are shared between callers, so they must not be modified.
+    """
+
+    def __init__(self, max_entries: int = 32, cache_dir: str = None,
+                 max_disk_bytes: int = 256 * 1024 * 1024) -> None:
+        """Initialize this AnalysisCache.
+
+        Raises ValueError if max_entries <= 0.
+
+        >>> tmpdir = tempfile.TemporaryDirectory()
+        >>> cache = AnalysisCache(cache_dir=tmpdir.name)
+        >>> hist = cache.build_histogram('two_cities.txt')  # computed
+        >>> hist = cache.build_histogram('two_cities.txt')  # cached
+        >>> tmpdir.cleanup()
+        """
+        if max_entries <= 0:
+            raise ValueError('AnalysisCache: max_entries must be > 0')
+        self._max_entries = max_entries
+        self._cache_dir = cache_dir
+        self._max_disk_bytes = max_disk_bytes
+        self._entries = OrderedDict()  # key -> result, least recent first
+        self.hits = 0
+        self.misses = 0
+
+        if cache_dir is not None:
+            os.makedirs(cache_dir, exist_ok=True)
+
+    def __len__(self) -> int:
+        """Return the number of results cached in memory."""
+        return len(self._entries)
+
+    def build_histogram(self, filename: str,
+                        tokenizer: Tokenizer = None) -> dict[str, int]:
+        """Return build_histogram(filename, tokenizer), using a cached result
+        if the file hasn't changed.
+        """
+        return self.get(build_histogram, filename, tokenizer)
+
+    def build_word_list(self, filename: str,
+                        tokenizer: Tokenizer = None) -> list[str]:
+        """Return build_word_list(filename, tokenizer), using a cached result
+        if the file hasn't changed.
+        """
+        return self.get(build_word_list, filename, tokenizer)
+
+    def get(self, function, filename: str, tokenizer: Tokenizer = None):
+        """Return function(filename, tokenizer), using a cached result if
+        the file hasn't changed since the result was computed.
+
+        function must be a module-level LAB1 analysis function with the
+        signature function(filename, tokenizer).
+        """
+        if tokenizer is None:
+            tokenizer = DEFAULT_TOKENIZER
+
+        # stat() before computing the result: if the file changes while it
+        # is being read, the result is cached under the old size and
+        # modification time, and will be recomputed by the next call.
+        path = os.path.abspath(filename)
+        stat = os.stat(path)
+        key = ('{0}.{1}'.format(function.__module__, function.__qualname__),
+               path, stat.st_size, stat.st_mtime_ns, tokenizer.settings())
+
+        if key in self._entries:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return self._entries[key]
+
+        result = self._load(key)
+        if result is None:
+            self.misses += 1
+            result = function(filename, tokenizer)
+            self._save(key, result)
+        else:
+            self.hits += 1
+
+        self._entries[key] = result
+        if len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+        return result
+
+    def clear(self) -> None:
+        """Discard all the results cached in memory and on disk."""
+        self._entries.clear()
+        if self._cache_dir is not None:
+            for path, _, _ in self._disk_files():
+                os.remove(path)
+
+    def _path(self, key: tuple) -> str:
+        """Return the path of the file that holds the result for key."""
+        digest = hashlib.sha1(repr(key).encode('utf-8')).hexdigest()
+        return os.path.join(self._cache_dir, digest + '.pickle')
+
+    def _load(self, key: tuple):
+        """Return the result for key stored on disk, or None if there isn't
+        one.
+        """
+        if self._cache_dir is None:
+            return None
+        path = self._path(key)
+        try:
+            with open(path, 'rb') as infile:
+                stored_key, result = pickle.load(infile)
+        except (OSError, EOFError, pickle.UnpicklingError):
+            return None
+        if stored_key != key:
+            return None
+
+        # Record the use, for least-recently-used eviction.
+        os.utime(path)
+        return result
+
+    def _save(self, key: tuple, result) -> None:
+        """Store the result for key on disk, then delete the least recently
+        used files until the total size of the cache directory is no more
+        than max_disk_bytes.
+        """
+        if self._cache_dir is None:
+            return
+        path = self._path(key)
+
+        # Write to a temporary file and rename it, so that another process
+        # never reads a partially written result.
+        fd, tmp_path = tempfile.mkstemp(dir=self._cache_dir, suffix='.tmp')
+        with os.fdopen(fd, 'wb') as outfile:
+            pickle.dump((key, result), outfile,
+                        protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
+
+        files = sorted(self._disk_files(), key=lambda f: f[2])
+        total = sum(size for _, size, _ in files)
+        for old_path, size, _ in files:
+            if total <= self._max_disk_bytes or old_path == path:
+                break
+            os.remove(old_path)
+            total -= size
+
+    def _disk_files(self) -> list[tuple[str, int, float]]:
+        """Return a list of (path, size, modification time) tuples for the
+        results stored in the cache directory.
+        """
+        files = []
+        for entry in os.scandir(self._cache_dir):
+            if entry.name.endswith('.pickle'):
+                stat = entry.stat()
+                files.append((entry.path, stat.st_size, stat.st_mtime))
+        return files
+
+
+if __name__ == '__main__':
+    with tempfile.TemporaryDirectory() as cache_dir:
+        cache = AnalysisCache(cache_dir=cache_dir)
+        for attempt in ['first call', 'second call']:
+            start = time.perf_counter()
+            hist = cache.build_histogram('sons_of_martha.txt')
+            elapsed = time.perf_counter() - start
+            print('{0}: {1:.1f} us'.format(attempt, elapsed * 1e6))
+
+        # A new cache (e.g., in another process) finds the result on disk.
+        cache = AnalysisCache(cache_dir=cache_dir)
+        assert cache.build_histogram('sons_of_martha.txt') == hist
+        print('hits:', cache.hits, 'misses:', cache.misses)
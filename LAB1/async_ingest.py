@@ -0,0 +1,335 @@
+"""
+SYSC 2100 Winter 2023
+Lab 1, Asynchronous ingest
+Builds histograms and concordances from many slow sources at once (pipes,
+FIFOs, sockets, or ordinary files), instead of reading one source at a
+time with a blocking 'for line in infile' loop.
+
+The pipeline has three stages, connected by bounded queues:
+- one reader coroutine per source, which reads blocks of whole lines;
+- worker coroutines, which tokenize the blocks in an executor (a thread
+  pool by default, or a process pool supplied by the caller);
+- a single aggregator, which merges the partial results.
+When a queue is full, the stage feeding it waits, so memory use stays
+bounded no matter how fast the sources are.
+"""
+
+__author__ = 'Rama Alkhouli'
+
+import asyncio
+import concurrent.futures
+import functools
+import os
+import stat
+import tempfile
+import threading
+import time
+from array import array
+from collections import Counter
+
+from concordance import line_end, normalize_newlines
+from tokenizer import DEFAULT_TOKENIZER, Tokenizer
+from word_histogram import build_histogram
+
+# Maximum number of blocks waiting in each queue.
+QUEUE_SIZE = 16
+
+# Number of bytes requested from a source at a time.
+READ_SIZE = 64 * 1024
+
+# Maximum number of bytes of an unfinished line held back while waiting for
+# its line ending. A longer line is passed on in pieces, split at
+# whitespace (a word longer than this is split too).
+MAX_LINE_SIZE = 1024 * 1024
+
+# ASCII characters that str.split treats as whitespace, other than line
+# endings.
+_WHITESPACE = b' \t\x0b\x0c\x1c\x1d\x1e\x1f'
+
+# A worker puts this on the results queue when it has finished.
+_DONE = None
+
+
+async def ingest_histogram(sources: list, tokenizer: Tokenizer = None,
+                           executor=None, workers: int = None,
+                           queue_size: int = QUEUE_SIZE) -> dict[str, int]:
+    """Return a histogram of the words in all the sources, like the one
+    build_histogram returns for a single file.
+
+    Each source is the name of a file (which may be a FIFO) or an
+    asyncio.StreamReader. Blocks of lines are tokenized by the specified
+    number of worker coroutines (by default, one per CPU), which run the
+    tokenizer in executor (by default, the event loop's thread pool).
+
+    >>> hist = asyncio.run(ingest_histogram(['sons_of_martha.txt',
+    ...                                      'two_cities.txt']))
+    """
+    if tokenizer is None:
+        tokenizer = DEFAULT_TOKENIZER
+    hist = Counter()
+
+    def merge(source_no, block_no, partial):
+        hist.update(partial)
+
+    await _run(sources, _count_block, tokenizer, merge, executor, workers,
+               queue_size)
+    return dict(hist)
+
+
+async def ingest_concordances(sources: list, tokenizer: Tokenizer = None,
+                              executor=None, workers: int = None,
+                              queue_size: int = QUEUE_SIZE
+                              ) -> list[dict[str, array]]:
+    """Return a list containing a concordance for each source, in the same
+    order as sources. Each concordance is like the one build_concordance
+    returns for a single file.
+
+    See ingest_histogram for a description of the arguments.
+    """
+    if tokenizer is None:
+        tokenizer = DEFAULT_TOKENIZER
+    concordances = [{} for _ in sources]
+
+    # Blocks from the same source may be tokenized out of order, but the
+    # line numbers must be appended in ascending order, so a block's
+    # partial concordance is held here until all the earlier blocks from
+    # its source have been merged.
+    pending = [{} for _ in sources]
+    next_block = [0] * len(sources)
+
+    def merge(source_no, block_no, partial):
+        pending[source_no][block_no] = partial
+        concordance = concordances[source_no]
+        while next_block[source_no] in pending[source_no]:
+            partial = pending[source_no].pop(next_block[source_no])
+            next_block[source_no] += 1
+            for word, lines in partial.items():
+                existing = concordance.get(word)
+                if existing is None:
+                    concordance[word] = lines
+                elif existing[-1] == lines[0]:
+                    existing.extend(lines[1:])
+                else:
+                    existing.extend(lines)
+
+    await _run(sources, _concordance_block, tokenizer, merge, executor,
+               workers, queue_size)
+    return concordances
+
+
+async def _run(sources: list, work, tokenizer: Tokenizer, merge, executor,
+               workers: int, queue_size: int) -> None:
+    """Run the reader, worker and aggregator stages until every source has
+    been read and every block has been merged.
+
+    work(tokenizer, text, first_line_no) runs in the executor and returns
+    a block's partial result. merge(source_no, block_no, partial) runs in
+    the aggregator.
+    """
+    if workers is None:
+        workers = os.cpu_count() or 1
+    blocks = asyncio.Queue(queue_size)
+    results = asyncio.Queue(queue_size)
+
+    async def worker():
+        loop = asyncio.get_running_loop()
+        while True:
+            item = await blocks.get()
+            if item is _DONE:
+                await results.put(_DONE)
+                return
+            source_no, block_no, first_line_no, text = item
+            partial = await loop.run_in_executor(executor, work, tokenizer,
+                                                 text, first_line_no)
+            await results.put((source_no, block_no, partial))
+
+    async def aggregator():
+        finished = 0
+        while finished < workers:
+            item = await results.get()
+            if item is _DONE:
+                finished += 1
+            else:
+                merge(*item)
+
+    async def readers():
+        async with asyncio.TaskGroup() as group:
+            for source_no, source in enumerate(sources):
+                group.create_task(_read(source, source_no, blocks,
+                                        io_executor))
+        for _ in range(workers):
+            await blocks.put(_DONE)
+
+    # Opening a FIFO blocks until a writer opens it, and reading an ordinary
+    # file blocks too. Each source has its own I/O thread, so a FIFO with no
+    # writer can't hold up the other sources or the workers' executor.
+    io_executor = concurrent.futures.ThreadPoolExecutor(
+        max_workers=max(1, len(sources)), thread_name_prefix='ingest-io')
+    try:
+        async with asyncio.TaskGroup() as group:
+            group.create_task(readers())
+            for _ in range(workers):
+                group.create_task(worker())
+            group.create_task(aggregator())
+    finally:
+        # Don't wait for opens of FIFOs that never got a writer.
+        io_executor.shutdown(wait=False, cancel_futures=True)
+
+
+async def _read(source, source_no: int, blocks: asyncio.Queue,
+                io_executor) -> None:
+    """Read source in blocks of whole lines and put a (source_no, block_no,
+    first line number, text) tuple on the blocks queue for each one.
+
+    Lines can end with '\\n', '\\r\\n' or '\\r', as in a file read in text
+    mode; they are all converted to '\\n' in the text of the blocks. A line
+    longer than MAX_LINE_SIZE bytes is split between blocks. Blocking opens
+    and reads run in io_executor.
+    """
+    block_no = 0
+    line_no = 1
+    leftover = b''
+    async with _open(source, io_executor) as read:
+        while True:
+            data = await read(READ_SIZE)
+            if not data:
+                break
+            data = leftover + data
+            end = line_end(data)
+            if end == 0:
+                if len(data) < MAX_LINE_SIZE:
+                    # No complete line yet.
+                    leftover = data
+                    continue
+                # Pass on the start of a very long line, so that leftover
+                # doesn't grow without bound. The next block starts on the
+                # same line.
+                end = _split_point(data)
+            leftover = data[end:]
+            text = normalize_newlines(data[:end].decode('utf-8'))
+            await blocks.put((source_no, block_no, line_no, text))
+            block_no += 1
+            line_no += text.count('\n')
+
+    if leftover:
+        # The last line has no newline.
+        await blocks.put((source_no, block_no, line_no,
+                          normalize_newlines(leftover.decode('utf-8'))))
+
+
+class _open:
+    """An async context manager that opens a source and provides an
+    async read(n) function for it.
+
+    FIFOs and sockets are read with the event loop's non-blocking pipe
+    support. Ordinary files can't be waited on by the event loop, so they
+    are read in executor, which is also used to open the source. A
+    StreamReader is used as is.
+    """
+
+    def __init__(self, source, executor) -> None:
+        self._source = source
+        self._executor = executor
+        self._file = None
+        self._transport = None
+
+    async def __aenter__(self):
+        loop = asyncio.get_running_loop()
+        if isinstance(self._source, asyncio.StreamReader):
+            return self._source.read
+
+        # Opening a FIFO blocks until a writer opens it, so the file is
+        # opened in the executor to keep the other sources flowing.
+        self._file = await loop.run_in_executor(
+            self._executor,
+            functools.partial(open, self._source, 'rb', buffering=0))
+        mode = os.fstat(self._file.fileno()).st_mode
+        if stat.S_ISFIFO(mode) or stat.S_ISSOCK(mode) or stat.S_ISCHR(mode):
+            reader = asyncio.StreamReader(limit=READ_SIZE)
+            self._transport, _ = await loop.connect_read_pipe(
+                lambda: asyncio.StreamReaderProtocol(reader), self._file)
+            return reader.read
+
+        async def read(n):
+            return await loop.run_in_executor(self._executor,
+                                              self._file.read, n)
+        return read
+
+    async def __aexit__(self, *exc_info) -> None:
+        if self._transport is not None:
+            self._transport.close()
+        if self._file is not None:
+            self._file.close()
+
+
+def _split_point(data: bytes) -> int:
+    """Return the index at which to split data, the start of a line that has
+    no line ending yet: just after its last whitespace character or, if it
+    has none, at the start of its last (possibly incomplete) UTF-8
+    character.
+    """
+    end = max([data.rfind(bytes([c])) for c in _WHITESPACE]) + 1
+    if end > 0:
+        return end
+    end = len(data) - 1
+    while end > 0 and data[end] & 0xC0 == 0x80:
+        end -= 1
+    return end
+
+
+def _count_block(tokenizer: Tokenizer, text: str,
+                 first_line_no: int) -> Counter:
+    """Return the word counts for a block of text."""
+    return tokenizer.count(text)
+
+
+def _concordance_block(tokenizer: Tokenizer, text: str,
+                       first_line_no: int) -> dict[str, array]:
+    """Return the concordance of a block of lines, numbered from
+    first_line_no. The lines end with '\\n' (_read converts the other line
+    endings), so they are numbered as build_concordance numbers them.
+    """
+    concordance = {}
+    line_no = first_line_no
+    for line in text.split('\n'):
+        for word in tokenizer.tokenize(line):
+            lines = concordance.get(word)
+            if lines is None:
+                concordance[word] = array('I', [line_no])
+            elif lines[-1] != line_no:
+                lines.append(line_no)
+        line_no += 1
+    return concordance
+
+
+if __name__ == '__main__':
+    # Demonstration: 8 FIFOs, each fed by a slow writer thread that writes
+    # sons_of_martha.txt one line at a time.
+    with open('sons_of_martha.txt', 'rb') as infile:
+        lines = infile.read().splitlines(keepends=True)
+
+    def slow_writer(path):
+        with open(path, 'wb') as fifo:
+            for line in lines:
+                fifo.write(line)
+                fifo.flush()
+                time.sleep(0.005)
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        paths = []
+        for i in range(8):
+            path = os.path.join(tmpdir, 'fifo{0}'.format(i))
+            os.mkfifo(path)
+            paths.append(path)
+            threading.Thread(target=slow_writer, args=(path,)).start()
+
+        start = time.perf_counter()
+        hist = asyncio.run(ingest_histogram(paths))
+        elapsed = time.perf_counter() - start
+
+    expected = Counter(build_histogram('sons_of_martha.txt'))
+    for word in expected:
+        expected[word] *= len(paths)
+    assert hist == dict(expected)
+    print('{0} FIFOs read concurrently in {1:.2f} s (one FIFO alone takes '
+          'about {2:.2f} s)'.format(len(paths), elapsed, 0.005 * len(lines)))
@@ -0,0 +1,239 @@
+"""
+SYSC 2100 Winter 2023
+Lab 1, Benchmarks
+Times build_word_list, build_histogram, build_concordance,
+most_frequent_word and words_with_frequency on synthetic corpora of
+increasing size (made by replicating one of the lab's text files), and
+reports the throughput, peak memory use and time of each stage as JSON, so
+that results from different versions can be compared.
+
+Usage: python benchmark.py [--sizes 1MB 10MB 100MB 1GB] [--stages ...]
+                           [--source FILE] [--repeat N] [--output FILE]
+
+Each stage runs in a freshly started process, so its peak resident set size
+(RSS) isn't inflated by the stages that ran before it.
+"""
+
+__author__ = 'Rama Alkhouli'
+
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import re
+import resource
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from build_word_list import build_word_list
+from concordance import build_concordance
+from corpus import make_corpus
+from word_histogram import build_histogram, most_frequent_word, \
+    words_with_frequency
+
+# Stages that read the corpus file. Their throughput is reported in MB/s.
+FILE_STAGES = {
+    'build_word_list': build_word_list,
+    'build_histogram': build_histogram,
+    'build_concordance': build_concordance,
+}
+
+# Stages that query the histogram of the corpus. The histogram is built
+# before the timer starts, and their throughput is reported in distinct
+# words per second. These stages are fast, so each is called repeatedly
+# for at least MIN_QUERY_SECONDS and the mean time per call is reported.
+HISTOGRAM_STAGES = {
+    'most_frequent_word': most_frequent_word,
+    'words_with_frequency': lambda hist: words_with_frequency(hist, 1),
+}
+
+STAGES = list(FILE_STAGES) + list(HISTOGRAM_STAGES)
+
+MIN_QUERY_SECONDS = 0.2
+
+DEFAULT_SIZES = ['1MB', '10MB', '100MB', '1GB']
+
+_UNITS = {'': 1, 'B': 1, 'KB': 1 << 10, 'MB': 1 << 20, 'GB': 1 << 30}
+
+
+def parse_size(text: str) -> int:
+    """Return the number of bytes specified by a size such as '512KB',
+    '10MB' or '1GB' (units are powers of 1024; a bare number is bytes).
+
+    Raises ValueError if text isn't a valid size.
+
+    >>> parse_size('10MB')
+    10485760
+    """
+    match = re.fullmatch(r'\s*(\d+)\s*([KMG]?B?)\s*', text.upper())
+    if match is None:
+        raise ValueError('parse_size: invalid size {0!r}'.format(text))
+    return int(match.group(1)) * _UNITS[match.group(2)]
+
+
+def run_benchmarks(sizes: list[int], stages: list[str] = STAGES,
+                   source: str = 'sons_of_martha.txt', repeat: int = 1,
+                   tmpdir: str = None, progress=None) -> dict:
+    """Run each of the specified stages on a synthetic corpus of each of the
+    specified sizes (in bytes) and return the results as a dictionary that
+    can be serialized as JSON.
+
+    Each stage is run repeat times; the fastest time and the largest peak
+    RSS are reported. If progress is not None, it is called with each
+    stage's result as soon as it is available.
+
+    The result has a 'results' list with one entry per corpus size and
+    stage, and a 'corpora' list with the time taken to write each corpus.
+
+    Raises ValueError if a stage name is unknown.
+    """
+    for stage in stages:
+        if stage not in FILE_STAGES and stage not in HISTOGRAM_STAGES:
+            raise ValueError('run_benchmarks: unknown stage {0!r}'.format(stage))
+
+    results = []
+    corpora = []
+    # The 'spawn' start method gives each stage a new interpreter, rather
+    # than a copy of this process and everything it has allocated.
+    context = multiprocessing.get_context('spawn')
+    with tempfile.TemporaryDirectory(dir=tmpdir) as corpus_dir:
+        for size in sizes:
+            corpus = os.path.join(corpus_dir, 'corpus.txt')
+            start = time.perf_counter()
+            make_corpus(corpus, source, size)
+            corpus_bytes = os.path.getsize(corpus)
+            corpora.append({'corpus_bytes': corpus_bytes,
+                            'seconds': time.perf_counter() - start})
+
+            for stage in stages:
+                runs = []
+                for _ in range(repeat):
+                    with ProcessPoolExecutor(1, mp_context=context) as pool:
+                        runs.append(pool.submit(_run_stage, stage,
+                                                corpus).result())
+                seconds = min(run['seconds'] for run in runs)
+                result = {
+                    'stage': stage,
+                    'corpus_bytes': corpus_bytes,
+                    'seconds': seconds,
+                    'peak_rss_bytes': max(run['peak_rss_bytes']
+                                          for run in runs),
+                    'distinct_words': runs[0]['distinct_words'],
+                }
+                if stage in FILE_STAGES:
+                    result['throughput'] = corpus_bytes / (1 << 20) / \
+                        max(seconds, 1e-9)
+                    result['throughput_unit'] = 'MB/s'
+                else:
+                    result['throughput'] = result['distinct_words'] / \
+                        max(seconds, 1e-9)
+                    result['throughput_unit'] = 'words/s'
+                results.append(result)
+                if progress is not None:
+                    progress(result)
+            os.remove(corpus)
+
+    return {
+        'source': os.path.basename(source),
+        'repeat': repeat,
+        'python': platform.python_version(),
+        'implementation': platform.python_implementation(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+        'corpora': corpora,
+        'results': results,
+    }
+
+
+def _run_stage(stage: str, corpus: str) -> dict:
+    """Run one stage on the corpus file and return its time, the process's
+    peak RSS and the number of distinct words in the corpus. Runs in a
+    child process.
+    """
+    if stage in FILE_STAGES:
+        start = time.perf_counter()
+        result = FILE_STAGES[stage](corpus)
+        seconds = time.perf_counter() - start
+        distinct_words = len(result)
+    else:
+        function = HISTOGRAM_STAGES[stage]
+        hist = build_histogram(corpus)
+        calls = 0
+        start = time.perf_counter()
+        while True:
+            function(hist)
+            calls += 1
+            elapsed = time.perf_counter() - start
+            if elapsed >= MIN_QUERY_SECONDS:
+                break
+        seconds = elapsed / calls
+        distinct_words = len(hist)
+
+    # ru_maxrss is in kilobytes on Linux, but in bytes on macOS.
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if sys.platform != 'darwin':
+        peak *= 1024
+    return {'seconds': seconds, 'peak_rss_bytes': peak,
+            'distinct_words': distinct_words}
+
+
+def _print_result(result: dict) -> None:
+    """Print one stage's result as a line of a table, on stderr."""
+    print('{0:>10.1f} MB  {1:<22}{2:12.6f} s {3:14.1f} {4:<8}{5:8.1f} MB RSS'
+          .format(result['corpus_bytes'] / (1 << 20), result['stage'],
+                  result['seconds'], result['throughput'],
+                  result['throughput_unit'],
+                  result['peak_rss_bytes'] / (1 << 20)),
+          file=sys.stderr)
+
+
+def main(argv: list[str] = None) -> None:
+    parser = argparse.ArgumentParser(
+        description='Benchmark the LAB1 text-analysis functions on synthetic '
+                    'corpora and write the results as JSON.')
+    parser.add_argument('--sizes', nargs='+', default=DEFAULT_SIZES,
+                        metavar='SIZE',
+                        help='corpus sizes, e.g. 1MB 10MB 1GB (default: '
+                             '%(default)s)')
+    parser.add_argument('--stages', nargs='+', default=STAGES, choices=STAGES,
+                        metavar='STAGE',
+                        help='stages to run (default: all of %(default)s)')
+    parser.add_argument('--source', default='sons_of_martha.txt',
+                        help='text file replicated to make the corpora '
+                             '(default: %(default)s)')
+    parser.add_argument('--repeat', type=int, default=1,
+                        help='runs per stage; the fastest is reported '
+                             '(default: %(default)s)')
+    parser.add_argument('--tmpdir', default=None,
+                        help='directory in which the corpora are written')
+    parser.add_argument('--output', default='-',
+                        help='JSON output file (default: standard output)')
+    parser.add_argument('--quiet', action='store_true',
+                        help="don't print a table of results on stderr")
+    args = parser.parse_args(argv)
+
+    try:
+        sizes = [parse_size(size) for size in args.sizes]
+    except ValueError as e:
+        parser.error(str(e))
+    if args.repeat < 1:
+        parser.error('--repeat must be at least 1')
+
+    report = run_benchmarks(sizes, args.stages, args.source, args.repeat,
+                            args.tmpdir,
+                            None if args.quiet else _print_result)
+
+    if args.output == '-':
+        json.dump(report, sys.stdout, indent=2)
+        print()
+    else:
+        with open(args.output, 'w') as outfile:
+            json.dump(report, outfile, indent=2)
+
+
+if __name__ == '__main__':
+    main()
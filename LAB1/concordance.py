@@ -5,48 +5,161 @@ Lab 1, Part 3, Exercise 4, Extra-Practice Exercise 5
 
 __author__ = 'Rama Alkhouli'
 
-import string
+import os
+import sys
+import tempfile
+import time
+from array import array
 
-# For information about the string module, type help(string) at the shell
-# prompt, or browse "The Python Standard Library", Section "Built-in Types",
-# Subsection "Text Sequence Type - str" in the documentation
-# (available @ python.org).
+from corpus import make_corpus
+from tokenizer import DEFAULT_TOKENIZER, Tokenizer
 
 
-def build_concordance(filename: str) -> dict[str, list[int]]:
+def build_concordance(filename: str,
+                      tokenizer: Tokenizer = None) -> dict[str, array]:
     """Return a concordance of words in the text file
     with the specified filename.
 
     The concordance is stored in a dictionary. The keys are the words in the
-    text file. The value associated with each key is a list containing the line
-    numbers of all the lines in the file in which the word occurs.)
+    text file. The value associated with each key is an array of unsigned
+    ints (array('I')) containing the line numbers of all the lines in the
+    file in which the word occurs, in ascending order.)
+
+    The words are extracted by tokenizer (by default, a Tokenizer that
+    removes any leading or trailing punctuation and converts each word to
+    lower case).
 
     >>> concordance = build_concordance('sons_of_martha.txt')
     """
+    if tokenizer is None:
+        tokenizer = DEFAULT_TOKENIZER
+
     infile = open(filename, "r")
     line_no = 0
     hist = {}
 
     for line in infile:
-        word_list = line.split()
+        word_list = tokenizer.tokenize(line)
         line_no +=1
-        print (line_no)
 
         for word in word_list:
-            word = word.strip(string.punctuation).lower()
+            count = hist.get(word)
+            if count is None:
+                hist[word] = array('I', [line_no])
+
+            # Lines are read in ascending order, so line_no is already in
+            # the array iff it is the last line number appended. This keeps
+            # each append O(1), instead of searching the whole array.
+            elif count[-1] != line_no:
+                count.append(line_no)
+
+    infile.close()
+    return hist
+
+
+def update_concordance(filename: str, concordance: dict[str, array],
+                       checkpoint: tuple[int, int] = (0, 0),
+                       tokenizer: Tokenizer = None) -> tuple[int, int]:
+    """Add the lines that have been appended to the text file with the
+    specified filename since checkpoint was recorded to concordance, and
+    return a new checkpoint.
+
+    A checkpoint is a tuple containing the byte offset of the first line
+    that hasn't been indexed and the number of lines that have been indexed.
+    The default checkpoint, (0, 0), indexes the file from the start. Only
+    the bytes after the checkpoint are read, so the cost of an update is
+    proportional to the amount of new text.
+
+    A line is indexed only when it is complete (terminated by a line
+    ending), because an append-only log may contain a partially written last
+    line. As in build_concordance, which reads the file in text mode, a line
+    can end with '\\n', '\\r\\n' or '\\r'.
+
+    >>> concordance = {}
+    >>> checkpoint = update_concordance('two_cities.txt', concordance)
+    >>> # ... more lines are appended to two_cities.txt ...
+    >>> checkpoint = update_concordance('two_cities.txt', concordance,
+    ...                                 checkpoint)
+    """
+    if tokenizer is None:
+        tokenizer = DEFAULT_TOKENIZER
+
+    offset, line_no = checkpoint
+    infile = open(filename, "rb")
+    infile.seek(offset)
+    data = infile.read()
+    infile.close()
 
-            if word != '':
-                if word not in hist.keys():
-                    count = []
-                else:
-                    count = hist [word]
+    # Discard the incomplete last line (if any); it will be indexed by a
+    # later update, once its line ending has been appended.
+    end = line_end(data)
+    text = normalize_newlines(data[:end].decode('utf-8'))
 
-            if line_no not in count:
+    for line in text.split('\n')[:-1]:
+        word_list = tokenizer.tokenize(line)
+        line_no += 1
+
+        for word in word_list:
+            count = concordance.get(word)
+            if count is None:
+                concordance[word] = array('I', [line_no])
+
+            # Every line number already in the array is smaller than
+            # line_no, so only the last one needs to be checked.
+            elif count[-1] != line_no:
                 count.append(line_no)
-                hist[word] = count
 
-    print(hist)
+    return (offset + end, line_no)
+
+
+def line_end(data: bytes) -> int:
+    """Return the number of bytes in data up to and including the end of its
+    last complete line, or 0 if data doesn't contain a complete line.
+
+    A line ends with '\\n', '\\r\\n' or '\\r' (the line endings that are
+    recognized when a file is read in text mode). A '\\r' at the very end
+    of data doesn't end a line yet, because it may be the start of '\\r\\n'.
+
+    >>> line_end(b'one\\rtwo\\r\\nthree')
+    9
+    >>> line_end(b'one\\r')
+    0
+    """
+    if data.endswith(b'\r'):
+        data = data[:-1]
+    return max(data.rfind(b'\n'), data.rfind(b'\r')) + 1
+
+
+def normalize_newlines(text: str) -> str:
+    """Return text with its '\\r\\n' and '\\r' line endings replaced by
+    '\\n', as when a file is read in text mode.
+
+    >>> normalize_newlines('one\\rtwo\\r\\nthree\\n')
+    'one\\ntwo\\nthree\\n'
+    """
+    return text.replace('\r\n', '\n').replace('\r', '\n')
+
+
+def _benchmark(filename: str, factors: list[int]) -> None:
+    """Time build_concordance on copies of the specified file replicated
+    factor times, for each factor in factors. The time per line should stay
+    roughly constant as the file grows.
+    """
+    # make_corpus adds a newline to the end of the file if it has none.
+    with open(filename, 'rb') as infile:
+        data = infile.read()
+    size = len(data) if data.endswith(b'\n') else len(data) + 1
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        for factor in factors:
+            path = os.path.join(tmpdir, 'replicated.txt')
+            num_lines = make_corpus(path, filename, size * factor)
 
+            start = time.perf_counter()
+            build_concordance(path)
+            elapsed = time.perf_counter() - start
+            print('{0:>8}x {1:>10} lines {2:9.3f} s {3:8.2f} us/line'.format(
+                factor, num_lines, elapsed, elapsed / num_lines * 1e6))
 
 
 # Extra-Practice: Exercise 5 Solution
@@ -55,5 +168,11 @@ def build_concordance(filename: str) -> dict[str, list[int]]:
 if __name__ == '__main__':
     # Write your solution to Extra-practice Exercise 5 here
     filename = "two_cities.txt"
-    build_concordance(filename)
-    build_concordance("sons_of_martha.txt")
\ No newline at end of file
+    for name in [filename, "sons_of_martha.txt"]:
+        concordance = build_concordance(name)
+        print({word: lines.tolist() for word, lines in concordance.items()})
+
+    # Usage: python concordance.py benchmark
+    if sys.argv[1:] == ['benchmark']:
+        _benchmark(filename, [100, 1000, 10000, 100000])
+        _benchmark("sons_of_martha.txt", [1, 10, 100, 1000])
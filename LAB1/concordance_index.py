@@ -0,0 +1,231 @@
+"""
+SYSC 2100 Winter 2023
+Lab 1, Part 3, Concordance index
+Saves a concordance (see concordance.py) as a compact, read-only index file
+that can be searched without loading it into memory.
+"""
+
+__author__ = 'Rama Alkhouli'
+
+import mmap
+import struct
+import sys
+import time
+from array import array
+
+from concordance import build_concordance
+
+# Index file layout (all integers are little-endian):
+#
+#   header:   magic b'CIDX', number of terms n, offset of the term table,
+#             and the checkpoint (byte offset, line count) returned by
+#             concordance.update_concordance, so that the indexed file can
+#             be updated incrementally
+#   table:    n entries, one per term, sorted by the UTF-8 encoding of the
+#             term. Each entry holds the offset and length of the term's
+#             bytes and the offset and length of its posting list.
+#   terms:    the UTF-8 encoded terms, back to back.
+#   postings: for each term, the line numbers on which the term occurs,
+#             delta-encoded (first line number, then the differences between
+#             consecutive line numbers) and packed as varints.
+#
+# Because the table entries have a fixed size, a lookup is a binary search
+# that only touches O(log n) entries of the memory-mapped file.
+
+_MAGIC = b'CIDX'
+_HEADER = struct.Struct('<4sIQQQ')
+_ENTRY = struct.Struct('<QIQI')
+
+
+def save_index(concordance: dict[str, array], filename: str,
+               checkpoint: tuple[int, int] = (0, 0)) -> None:
+    """Save concordance (a dictionary that maps words to ascending arrays or
+    lists of line numbers) as an index file with the specified filename.
+
+    If the concordance was built by update_concordance, pass the checkpoint
+    it returned, so that the index can be brought up to date later.
+
+    >>> import os, tempfile
+    >>> tmpdir = tempfile.TemporaryDirectory()
+    >>> filename = os.path.join(tmpdir.name, 'two_cities.cidx')
+    >>> save_index(build_concordance('two_cities.txt'), filename)
+    >>> tmpdir.cleanup()
+    """
+    terms = sorted((word.encode('utf-8'), word) for word in concordance)
+
+    table_offset = _HEADER.size
+    terms_offset = table_offset + len(terms) * _ENTRY.size
+    term_bytes = bytearray()
+    postings = bytearray()
+    entries = []
+    for key, word in terms:
+        encoded = _encode_postings(concordance[word])
+        entries.append((len(term_bytes), len(key), len(postings), len(encoded)))
+        term_bytes += key
+        postings += encoded
+    postings_offset = terms_offset + len(term_bytes)
+
+    with open(filename, 'wb') as outfile:
+        outfile.write(_HEADER.pack(_MAGIC, len(terms), table_offset,
+                                   checkpoint[0], checkpoint[1]))
+        for term_off, term_len, post_off, post_len in entries:
+            outfile.write(_ENTRY.pack(terms_offset + term_off, term_len,
+                                      postings_offset + post_off, post_len))
+        outfile.write(term_bytes)
+        outfile.write(postings)
+
+
+class ConcordanceIndex:
+    """A read-only concordance backed by a memory-mapped index file created
+    by save_index.
+    """
+
+    def __init__(self, filename: str) -> None:
+        """Open the index file with the specified filename.
+
+        Raises ValueError if the file isn't a concordance index.
+
+        >>> import os, tempfile
+        >>> tmpdir = tempfile.TemporaryDirectory()
+        >>> filename = os.path.join(tmpdir.name, 'two_cities.cidx')
+        >>> save_index(build_concordance('two_cities.txt'), filename)
+        >>> index = ConcordanceIndex(filename)
+        >>> index.lookup('times')
+        [1, 2]
+        >>> index.close()
+        >>> tmpdir.cleanup()
+        """
+        with open(filename, 'rb') as infile:
+            self._mm = mmap.mmap(infile.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(self._mm) < _HEADER.size:
+            self._mm.close()
+            raise ValueError('ConcordanceIndex: not a concordance index')
+        magic, self._num_terms, self._table, offset, line_no = \
+            _HEADER.unpack_from(self._mm)
+        if magic != _MAGIC:
+            self._mm.close()
+            raise ValueError('ConcordanceIndex: not a concordance index')
+
+        # The checkpoint to pass to update_concordance to index any lines
+        # appended to the text file after this index was saved.
+        self.checkpoint = (offset, line_no)
+
+    def __len__(self) -> int:
+        """Return the number of distinct words in this index."""
+        return self._num_terms
+
+    def __contains__(self, word: str) -> bool:
+        """Return True if word occurs in the indexed text; otherwise False."""
+        return self._find(word) >= 0
+
+    def __enter__(self) -> 'ConcordanceIndex':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Unmap the index file."""
+        self._mm.close()
+
+    def to_dict(self) -> dict[str, array]:
+        """Return the whole index as a concordance dictionary; e.g., to
+        update it with update_concordance.
+        """
+        mm = self._mm
+        concordance = {}
+        for i in range(self._num_terms):
+            term_off, term_len, post_off, post_len = _ENTRY.unpack_from(
+                mm, self._table + i * _ENTRY.size)
+            word = str(mm[term_off:term_off + term_len], 'utf-8')
+            concordance[word] = array('I', _decode_postings(
+                mm[post_off:post_off + post_len]))
+        return concordance
+
+    def lookup(self, word: str) -> list[int]:
+        """Return the list of line numbers on which word occurs, in ascending
+        order. If the word doesn't occur in the indexed text, the list is
+        empty.
+        """
+        i = self._find(word)
+        if i < 0:
+            return []
+        _, _, post_off, post_len = _ENTRY.unpack_from(
+            self._mm, self._table + i * _ENTRY.size)
+        return _decode_postings(self._mm[post_off:post_off + post_len])
+
+    def _find(self, word: str) -> int:
+        """Return the position of word in the term table, or -1 if the word
+        isn't in the table.
+        """
+        key = word.encode('utf-8')
+        mm = self._mm
+        lo = 0
+        hi = self._num_terms - 1
+        while lo <= hi:
+            mid = (lo + hi) // 2
+            term_off, term_len, _, _ = _ENTRY.unpack_from(
+                mm, self._table + mid * _ENTRY.size)
+            term = mm[term_off:term_off + term_len]
+            if term == key:
+                return mid
+            if term < key:
+                lo = mid + 1
+            else:
+                hi = mid - 1
+        return -1
+
+
+def _encode_postings(line_numbers: list[int]) -> bytes:
+    """Return the delta-encoded, varint-packed representation of an
+    ascending list of line numbers.
+    """
+    out = bytearray()
+    previous = 0
+    for line_no in line_numbers:
+        delta = line_no - previous
+        previous = line_no
+        # Varint: 7 bits per byte, least significant group first. The high
+        # bit of each byte is set if more bytes follow.
+        while delta >= 0x80:
+            out.append((delta & 0x7F) | 0x80)
+            delta >>= 7
+        out.append(delta)
+    return bytes(out)
+
+
+def _decode_postings(data: bytes) -> list[int]:
+    """Return the list of line numbers packed by _encode_postings."""
+    line_numbers = []
+    line_no = 0
+    delta = 0
+    shift = 0
+    for byte in data:
+        delta |= (byte & 0x7F) << shift
+        if byte & 0x80:
+            shift += 7
+        else:
+            line_no += delta
+            line_numbers.append(line_no)
+            delta = 0
+            shift = 0
+    return line_numbers
+
+
+if __name__ == '__main__':
+    # Usage: python concordance_index.py [text file] [word ...]
+    filename = sys.argv[1] if len(sys.argv) > 1 else 'two_cities.txt'
+    words = sys.argv[2:] or ['times', 'best', 'worst', 'zebra']
+
+    concordance = build_concordance(filename)
+    index_filename = filename + '.cidx'
+    save_index(concordance, index_filename)
+
+    with ConcordanceIndex(index_filename) as index:
+        for word in words:
+            start = time.perf_counter()
+            line_numbers = index.lookup(word)
+            elapsed = time.perf_counter() - start
+            assert line_numbers == list(concordance.get(word, []))
+            print('{0!r}: {1} ({2:.1f} us)'.format(word, line_numbers,
+                                                   elapsed * 1e6))
@@ -0,0 +1,45 @@
+"""
+SYSC 2100 Winter 2023
+Lab 1, Synthetic corpora
+Builds large text files for the benchmarks by replicating one of the lab's
+text files (used by benchmark.py, stream_histogram.py and concordance.py).
+"""
+
+__author__ = 'Rama Alkhouli'
+
+
+def make_corpus(path: str, source: str, size: int) -> int:
+    """Write a synthetic corpus to path by repeating the lines of the
+    source file until the corpus holds at least size bytes, and return the
+    number of lines written. The corpus always ends at the end of a line,
+    so if size is a multiple of the source's size (counting a final
+    newline), the corpus is exactly size // (source's size) copies of it.
+
+    Raises ValueError if the source file is empty.
+    """
+    with open(source, 'rb') as infile:
+        lines = infile.read().splitlines(keepends=True)
+    if lines == []:
+        raise ValueError('make_corpus: {0} is empty'.format(source))
+    if not lines[-1].endswith(b'\n'):
+        lines[-1] += b'\n'
+
+    # Write whole copies of the source in blocks of about 1 MB, then just
+    # enough lines to reach size.
+    text = b''.join(lines)
+    copies = max(1, (1 << 20) // len(text))
+    block = text * copies
+    num_lines = 0
+    with open(path, 'wb') as outfile:
+        written = 0
+        while written + len(block) <= size:
+            outfile.write(block)
+            written += len(block)
+            num_lines += copies * len(lines)
+        i = 0
+        while written < size:
+            outfile.write(lines[i])
+            written += len(lines[i])
+            num_lines += 1
+            i = (i + 1) % len(lines)
+    return num_lines
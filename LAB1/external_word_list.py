@@ -0,0 +1,148 @@
+"""
+SYSC 2100 Winter 2023
+Lab 1, Part 1, External-memory word list
+A version of build_word_list for files whose vocabulary doesn't fit in
+memory. Distinct words are collected until a memory budget is reached,
+then sorted and written ("spilled") to a temporary run file. The runs are
+finally merged into one sorted, duplicate-free stream of words.
+"""
+
+__author__ = 'Rama Alkhouli'
+
+import heapq
+import os
+import sys
+import tempfile
+
+from build_word_list import build_word_list
+from tokenizer import DEFAULT_TOKENIZER, Tokenizer
+
+# Default memory budget, in bytes, for the set of words collected before a
+# run is spilled to disk.
+MEMORY_BUDGET = 256 * 1024 * 1024
+
+# Approximate per-word cost of storing a word in a set, in addition to the
+# word's own size: a set slot plus the str object header.
+_WORD_OVERHEAD = 100
+
+
+def iter_word_list(filename: str, memory_budget: int = MEMORY_BUDGET,
+                   tokenizer: Tokenizer = None,
+                   tmpdir: str = None) -> 'generator':
+    """Return a generator that yields the distinct words in the text file
+    with the specified filename, in ascending order. The words are the same
+    as those in the list returned by build_word_list.
+
+    About memory_budget bytes are used to collect words. Whenever the
+    collected words exceed the budget, they are sorted and spilled to a
+    temporary file in tmpdir (by default, the system's temporary
+    directory). The temporary files are deleted when the generator is
+    exhausted or closed.
+
+    >>> words = list(iter_word_list('sons_of_martha.txt'))
+    >>> words == build_word_list('sons_of_martha.txt')
+    True
+
+    Words that contain characters below '\\n' (which sort before the end of
+    a line in a run file) are merged in the right order:
+
+    >>> import tempfile, tokenizer
+    >>> tmpdir = tempfile.TemporaryDirectory()
+    >>> text_file = os.path.join(tmpdir.name, 'control.txt')
+    >>> with open(text_file, 'w', encoding='utf-8') as outfile:
+    ...     for i in range(20):
+    ...         _ = outfile.write('a a\\x01 w{0} w{0}\\x01\\n'.format(i % 7))
+    >>> chunk_size, tokenizer.CHUNK_SIZE = tokenizer.CHUNK_SIZE, 50
+    >>> words = list(iter_word_list(text_file, memory_budget=300))
+    >>> tokenizer.CHUNK_SIZE = chunk_size
+    >>> words == build_word_list(text_file)
+    True
+    >>> len(words)
+    16
+    >>> tmpdir.cleanup()
+    """
+    if tokenizer is None:
+        tokenizer = DEFAULT_TOKENIZER
+
+    with tempfile.TemporaryDirectory(dir=tmpdir) as run_dir:
+        runs = []
+        word_set = set()
+        used = 0
+
+        with open(filename, "r") as infile:
+            for text in tokenizer.chunks(infile):
+                for word in tokenizer.count(text):
+                    if word not in word_set:
+                        word_set.add(word)
+                        used += len(word) + _WORD_OVERHEAD
+                if used >= memory_budget:
+                    runs.append(_spill(word_set, run_dir, len(runs)))
+                    word_set = set()
+                    used = 0
+
+        if runs == []:
+            # Everything fit in memory; no merge is needed.
+            yield from sorted(word_set)
+            return
+        if word_set:
+            runs.append(_spill(word_set, run_dir, len(runs)))
+        del word_set
+
+        files = []
+        try:
+            for run in runs:
+                files.append(open(run, 'r', encoding='utf-8', newline='\n'))
+            # Words can't contain whitespace, so each line of a run holds
+            # exactly one word. The newlines are removed before the lines are
+            # compared, because a word can contain characters that sort
+            # before '\n'. heapq.merge performs a k-way merge of the sorted
+            # runs; duplicates (words that are in more than one run) are
+            # adjacent in the merged stream.
+            previous = None
+            for word in heapq.merge(*[(line[:-1] for line in run)
+                                      for run in files]):
+                if word != previous:
+                    yield word
+                    previous = word
+        finally:
+            for run in files:
+                run.close()
+
+
+def write_word_list(filename: str, output: str,
+                    memory_budget: int = MEMORY_BUDGET,
+                    tokenizer: Tokenizer = None) -> int:
+    """Write the distinct words in the text file with the specified filename
+    to the file output, one word per line, in ascending order. Return the
+    number of words written.
+    """
+    count = 0
+    with open(output, 'w', encoding='utf-8') as outfile:
+        for word in iter_word_list(filename, memory_budget, tokenizer,
+                                   os.path.dirname(os.path.abspath(output))):
+            outfile.write(word)
+            outfile.write('\n')
+            count += 1
+    return count
+
+
+def _spill(word_set: set[str], run_dir: str, run_no: int) -> str:
+    """Write the words in word_set to a new run file in run_dir, sorted and
+    one per line, and return the file's path.
+    """
+    path = os.path.join(run_dir, 'run{0:06d}.txt'.format(run_no))
+    with open(path, 'w', encoding='utf-8', newline='\n') as outfile:
+        for word in sorted(word_set):
+            outfile.write(word)
+            outfile.write('\n')
+    return path
+
+
+if __name__ == '__main__':
+    # Usage: python external_word_list.py [text file] [memory budget, bytes]
+    filename = sys.argv[1] if len(sys.argv) > 1 else 'sons_of_martha.txt'
+    budget = int(sys.argv[2]) if len(sys.argv) > 2 else 2000
+
+    words = list(iter_word_list(filename, budget))
+    assert words == build_word_list(filename)
+    print('File', filename, 'contains', len(words), 'distinct words')
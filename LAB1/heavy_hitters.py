@@ -0,0 +1,169 @@
+"""
+SYSC 2100 Winter 2023
+Lab 1, Part 2, Heavy hitters
+Finds the most frequently occurring words in a stream of words using a
+fixed number of counters (the Space-Saving algorithm of Metwally, Agrawal
+and El Abbadi), instead of building a histogram of every distinct word.
+"""
+
+__author__ = 'Rama Alkhouli'
+
+import heapq
+
+from tokenizer import DEFAULT_TOKENIZER, Tokenizer
+
+
+class SpaceSaving:
+    """Approximate word counts for a stream of words, using at most
+    num_counters counters.
+
+    Every word is counted exactly until all the counters are in use. After
+    that, a word that isn't being counted takes over the counter with the
+    smallest count, c, and its count starts at c + 1 (so it may be
+    overestimated by at most c).
+
+    Guarantees, where n is the number of words added so far and m is the
+    number of counters:
+    - estimate(w) - error(w) <= the true count of w <= estimate(w);
+    - error(w) <= n / m;
+    - every word that occurs more than n / m times is being counted.
+    """
+
+    def __init__(self, num_counters: int) -> None:
+        """Initialize this SpaceSaving summary with num_counters counters.
+
+        Raises ValueError if num_counters <= 0.
+
+        >>> summary = SpaceSaving(100)
+        >>> len(summary)
+        0
+        """
+        if num_counters <= 0:
+            raise ValueError('SpaceSaving: num_counters must be > 0')
+        self._capacity = num_counters
+        self._total = 0        # of words added
+        self._counts = {}      # word -> estimated count
+        self._errors = {}      # word -> maximum overestimate of its count
+
+        # The words being counted, grouped by count, so that a word with the
+        # smallest count can be found in O(1) time. self._min is the smallest
+        # count (0 when no words have been added).
+        self._buckets = {}     # count -> set of words with that count
+        self._min = 0
+
+    def __len__(self) -> int:
+        """Return the number of words being counted."""
+        return len(self._counts)
+
+    def __contains__(self, word: str) -> bool:
+        """Return True if word is being counted; otherwise False."""
+        return word in self._counts
+
+    def add(self, word: str) -> None:
+        """Count one occurrence of word. Runs in O(1) time.
+
+        >>> summary = SpaceSaving(2)
+        >>> for word in ['a', 'b', 'a', 'c']:
+        ...     summary.add(word)
+        ...
+        >>> summary.top_k(2)
+        [('a', 2), ('c', 2)]
+        """
+        self._total += 1
+        counts = self._counts
+        count = counts.get(word)
+
+        if count is not None:
+            self._move(word, count, count + 1)
+            counts[word] = count + 1
+        elif len(counts) < self._capacity:
+            counts[word] = 1
+            self._errors[word] = 0
+            self._buckets.setdefault(1, set()).add(word)
+            self._min = 1
+        else:
+            # Replace a word that has the smallest count.
+            count = self._min
+            victim = self._buckets[count].pop()
+            del counts[victim]
+            del self._errors[victim]
+            if not self._buckets[count]:
+                del self._buckets[count]
+                self._min = count + 1
+            counts[word] = count + 1
+            self._errors[word] = count
+            self._buckets.setdefault(count + 1, set()).add(word)
+
+    def update(self, words) -> None:
+        """Count every word provided by the iterable words."""
+        for word in words:
+            self.add(word)
+
+    def estimate(self, word: str) -> int:
+        """Return the estimated count of word (an upper bound on its true
+        count). Returns 0 if the word isn't being counted.
+        """
+        return self._counts.get(word, 0)
+
+    def error(self, word: str) -> int:
+        """Return the maximum amount by which estimate(word) may exceed the
+        true count of word. If the word isn't being counted, return the
+        largest count it could have.
+        """
+        if word in self._errors:
+            return self._errors[word]
+        return self._min if len(self._counts) == self._capacity else 0
+
+    def top_k(self, k: int) -> list[tuple[str, int]]:
+        """Return a list of (word, estimated count) tuples for the k words
+        with the largest estimated counts, most frequent first.
+        """
+        return heapq.nlargest(k, self._counts.items(), key=lambda t: t[1])
+
+    def _move(self, word: str, old: int, new: int) -> None:
+        """Move word from the bucket for count old to the bucket for count
+        new (old + 1).
+        """
+        bucket = self._buckets[old]
+        bucket.remove(word)
+        if not bucket:
+            del self._buckets[old]
+            if old == self._min:
+                self._min = new
+        self._buckets.setdefault(new, set()).add(word)
+
+
+def most_frequent_words(filename: str, k: int, num_counters: int = 1000,
+                        tokenizer: Tokenizer = None) -> list[tuple[str, int]]:
+    """Return a list of (word, count) tuples for the (approximately) k most
+    frequently occurring words in the text file with the specified name,
+    most frequent first.
+
+    Unlike most_frequent_word(build_histogram(filename)), at most
+    num_counters words are kept in memory. The counts are exact if the file
+    has no more than num_counters distinct words; otherwise see SpaceSaving
+    for the error bounds.
+
+    >>> most_frequent_words('two_cities.txt', 2)
+    [('it', 2), ('was', 2)]
+    """
+    if tokenizer is None:
+        tokenizer = DEFAULT_TOKENIZER
+
+    summary = SpaceSaving(max(k, num_counters))
+    infile = open(filename, "r")
+    for text in tokenizer.chunks(infile):
+        summary.update(tokenizer.tokenize(text))
+    infile.close()
+    return summary.top_k(k)
+
+
+if __name__ == '__main__':
+    from word_histogram import build_histogram
+
+    filename = 'sons_of_martha.txt'
+    hist = build_histogram(filename)
+    exact = sorted(hist.items(), key=lambda t: t[1], reverse=True)[:5]
+    print('Exact top 5:', exact)
+    print('Space-Saving top 5 (50 counters):',
+          most_frequent_words(filename, 5, 50))
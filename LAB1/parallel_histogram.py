@@ -0,0 +1,120 @@
+"""
+SYSC 2100 Winter 2023
+Lab 1, Part 2, Parallel word histogram
+Builds one histogram from many files (or from one very large file) by
+sharding the work across a pool of worker processes and merging the
+partial histograms.
+"""
+
+__author__ = 'Rama Alkhouli'
+
+import mmap
+import os
+import sys
+import time
+from collections import Counter
+from multiprocessing import Pool
+
+from stream_histogram import count_range, find_boundary
+from tokenizer import Tokenizer
+from word_histogram import build_histogram
+
+# Files larger than this are split into byte ranges of about this size, so
+# that one big file keeps every worker busy.
+SPLIT_SIZE = 64 * 1024 * 1024
+
+
+def build_histogram_parallel(filenames: list[str], workers: int = None,
+                             split_size: int = SPLIT_SIZE,
+                             tokenizer: Tokenizer = None) -> dict[str, int]:
+    """Return a histogram of the words in all the text files with the
+    specified names.
+
+    The histogram is identical to the one obtained by calling build_histogram
+    on each file in turn and adding up the counts, but the files are divided
+    into tasks (whole files, or whitespace-aligned byte ranges of large
+    files) that are processed by a pool of worker processes. By default,
+    one worker is started for each CPU. Each worker extracts words with
+    tokenizer (by default, the same Tokenizer that build_histogram uses).
+
+    >>> hist = build_histogram_parallel(['two_cities.txt'])
+    >>> hist == build_histogram('two_cities.txt')
+    True
+    """
+    tasks = []
+    for filename in filenames:
+        for _, start, end in split_file(filename, split_size):
+            tasks.append((filename, start, end, tokenizer))
+
+    hist = Counter()
+    if len(tasks) <= 1 or workers == 1:
+        # Not worth the cost of starting a pool.
+        for task in tasks:
+            hist.update(_count_task(task))
+    else:
+        with Pool(workers) as pool:
+            # Merge the partial histograms as they arrive, in whatever order
+            # the workers finish. Several small tasks are sent to a worker at
+            # a time to reduce the interprocess communication overhead.
+            chunksize = max(1, len(tasks) // (4 * (workers or os.cpu_count())))
+            for partial in pool.imap_unordered(_count_task, tasks, chunksize):
+                hist.update(partial)
+
+    return dict(hist)
+
+
+def split_file(filename: str, split_size: int = SPLIT_SIZE
+               ) -> list[tuple[str, int, int]]:
+    """Return a list of (filename, start, end) tasks that divide the file
+    into byte ranges of about split_size bytes. Every range starts and ends
+    at a whitespace byte (or at the start/end of the file), so no word is
+    split between two ranges.
+    """
+    size = os.path.getsize(filename)
+    if size <= split_size:
+        return [(filename, 0, size)]
+
+    tasks = []
+    with open(filename, 'rb') as infile:
+        with mmap.mmap(infile.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            start = 0
+            while start < size:
+                end = find_boundary(mm, min(start + split_size, size), size)
+                tasks.append((filename, start, end))
+                start = end
+    return tasks
+
+
+def _count_task(task: tuple[str, int, int, Tokenizer]) -> Counter:
+    """Return a Counter holding the word counts for one (filename, start,
+    end, tokenizer) task. Runs in a worker process.
+    """
+    filename, start, end, tokenizer = task
+    counts = Counter()
+    if start == end:
+        # Also covers empty files, which can't be memory-mapped.
+        return counts
+    with open(filename, 'rb') as infile:
+        with mmap.mmap(infile.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            count_range(mm, start, end, counts, tokenizer=tokenizer)
+    return counts
+
+
+if __name__ == '__main__':
+    # Usage: python parallel_histogram.py [file ...]
+    filenames = sys.argv[1:] or ['sons_of_martha.txt', 'two_cities.txt']
+
+    start = time.perf_counter()
+    expected = Counter()
+    for filename in filenames:
+        expected.update(build_histogram(filename))
+    serial = time.perf_counter() - start
+
+    start = time.perf_counter()
+    hist = build_histogram_parallel(filenames)
+    parallel = time.perf_counter() - start
+
+    assert hist == dict(expected)
+    print('{0} files, {1} distinct words'.format(len(filenames), len(hist)))
+    print('serial: {0:.3f} s, parallel ({1} workers): {2:.3f} s'.format(
+        serial, os.cpu_count(), parallel))
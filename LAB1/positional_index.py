@@ -0,0 +1,208 @@
+"""
+SYSC 2100 Winter 2023
+Lab 1, Part 3, Positional index
+A concordance that records where on each line a word occurs, not just the
+line, so that phrase and proximity queries can be answered from the index
+instead of by rescanning the text.
+"""
+
+__author__ = 'Rama Alkhouli'
+
+import bisect
+import sys
+from array import array
+
+from tokenizer import DEFAULT_TOKENIZER, Tokenizer
+
+
+class PositionalIndex:
+    """An index of the positions of the words in a text.
+
+    The words of the text are numbered 0, 1, 2, ... in the order in which
+    they occur (their global positions). For each word, the index stores an
+    array of its global positions, in ascending order. A separate array holds
+    the global position of the first word on each line, which is used to
+    convert a global position to a (line number, offset) posting: the line
+    number (starting at 1, as in build_concordance) and the position of the
+    word on that line (starting at 0).
+    """
+
+    def __init__(self, tokenizer: Tokenizer = None) -> None:
+        """Initialize this PositionalIndex to be empty. Text added to the
+        index and phrase queries are split into words by tokenizer.
+
+        >>> index = PositionalIndex()
+        >>> index.add_line('It was the best of times,')
+        >>> index.add_line('it was the worst of times.')
+        >>> index.postings('times')
+        [(1, 5), (2, 5)]
+        """
+        if tokenizer is None:
+            tokenizer = DEFAULT_TOKENIZER
+        self._tokenizer = tokenizer
+        self._postings = {}            # word -> array of global positions
+        self._line_starts = array('q')
+        self._num_words = 0
+
+    def __len__(self) -> int:
+        """Return the number of distinct words in this index."""
+        return len(self._postings)
+
+    def __contains__(self, word: str) -> bool:
+        """Return True if word is in this index; otherwise False."""
+        return word in self._postings
+
+    def add_line(self, line: str) -> None:
+        """Append a line of text to the indexed text."""
+        self._line_starts.append(self._num_words)
+        postings = self._postings
+        position = self._num_words
+        for word in self._tokenizer.tokenize(line):
+            positions = postings.get(word)
+            if positions is None:
+                positions = postings[word] = array('q')
+            positions.append(position)
+            position += 1
+        self._num_words = position
+
+    def postings(self, word: str) -> list[tuple[int, int]]:
+        """Return a list of (line number, offset) tuples for each occurrence
+        of word, in the order in which they occur.
+        """
+        return [self._locate(p) for p in self._postings.get(word, ())]
+
+    def concordance(self) -> dict[str, array]:
+        """Return the concordance of the indexed text; i.e., a dictionary
+        identical to the one returned by build_concordance.
+        """
+        concordance = {}
+        for word, positions in self._postings.items():
+            lines = array('I')
+            for p in positions:
+                line_no = self._locate(p)[0]
+                if len(lines) == 0 or lines[-1] != line_no:
+                    lines.append(line_no)
+            concordance[word] = lines
+        return concordance
+
+    def phrase(self, phrase: str) -> list[tuple[int, int]]:
+        """Return a list of (line number, offset) tuples giving the start of
+        each occurrence of phrase in the indexed text. The phrase is split
+        into words by this index's tokenizer. An occurrence may continue
+        from one line onto the next.
+
+        >>> index = build_positional_index('two_cities.txt')
+        >>> index.phrase('best of times')
+        [(1, 3)]
+        """
+        words = self._tokenizer.tokenize(phrase)
+        if words == []:
+            return []
+        for word in words:
+            if word not in self._postings:
+                return []
+
+        # Start with the candidates from the word with the fewest
+        # occurrences, then remove the candidates that aren't followed by
+        # the other words (the rarest first) at the right distance.
+        order = sorted(range(len(words)),
+                       key=lambda i: len(self._postings[words[i]]))
+        first = order[0]
+        starts = [p - first for p in self._postings[words[first]]]
+        for i in order[1:]:
+            if starts == []:
+                break
+            starts = _intersect(starts, self._postings[words[i]], i)
+        return [self._locate(p) for p in starts]
+
+    def near(self, word1: str, word2: str,
+             distance: int) -> list[tuple[int, int]]:
+        """Return a list of (line number, offset) tuples for each occurrence
+        of word1 that is no more than distance words before or after an
+        occurrence of word2.
+
+        >>> index = build_positional_index('two_cities.txt')
+        >>> index.near('best', 'times', 2)
+        [(1, 3)]
+        """
+        positions1 = self._postings.get(word1, ())
+        positions2 = self._postings.get(word2, ())
+        result = []
+        j = 0
+        for p in positions1:
+            # Galloping from the previous match keeps the whole search
+            # O(m log(n / m)) for m occurrences of word1.
+            j = _gallop(positions2, p - distance, j)
+            if j == len(positions2):
+                break
+            q = positions2[j]
+            if q == p and j + 1 < len(positions2):
+                # word1 and word2 are the same word; skip this occurrence.
+                q = positions2[j + 1]
+            if q != p and q <= p + distance:
+                result.append(self._locate(p))
+        return result
+
+    def _locate(self, position: int) -> tuple[int, int]:
+        """Return the (line number, offset) tuple for a global position."""
+        # Lines without words have the same start as the following line, so
+        # bisect_right finds the line the word is actually on.
+        line_no = bisect.bisect_right(self._line_starts, position)
+        return (line_no, position - self._line_starts[line_no - 1])
+
+
+def build_positional_index(filename: str,
+                           tokenizer: Tokenizer = None) -> PositionalIndex:
+    """Return a PositionalIndex of the words in the text file with the
+    specified filename.
+    """
+    index = PositionalIndex(tokenizer)
+    infile = open(filename, "r")
+    for line in infile:
+        index.add_line(line)
+    infile.close()
+    return index
+
+
+def _gallop(positions: array, target: int, lo: int) -> int:
+    """Return the smallest index i >= lo such that positions[i] >= target,
+    or len(positions) if there isn't one.
+
+    The search probes lo, lo + 1, lo + 3, lo + 7, ... until it passes
+    target, then does a binary search of the last interval, so finding a
+    target that is k elements ahead takes O(log k) time.
+    """
+    n = len(positions)
+    step = 1
+    hi = lo
+    while hi < n and positions[hi] < target:
+        lo = hi + 1
+        hi += step
+        step *= 2
+    return bisect.bisect_left(positions, target, lo, min(hi, n))
+
+
+def _intersect(starts: list[int], positions: array, shift: int) -> list[int]:
+    """Return the elements s of the ascending list starts for which s + shift
+    is in the ascending array positions, using a galloping merge.
+    """
+    result = []
+    j = 0
+    n = len(positions)
+    for s in starts:
+        j = _gallop(positions, s + shift, j)
+        if j == n:
+            break
+        if positions[j] == s + shift:
+            result.append(s)
+    return result
+
+
+if __name__ == '__main__':
+    # Usage: python positional_index.py [text file] [phrase ...]
+    filename = sys.argv[1] if len(sys.argv) > 1 else 'two_cities.txt'
+    phrases = sys.argv[2:] or ['best of times', 'it was the', 'of times it']
+
+    index = build_positional_index(filename)
+    for phrase in phrases:
+        print('{0!r}: {1}'.format(phrase, index.phrase(phrase)))
@@ -0,0 +1,252 @@
+"""
+SYSC 2100 Winter 2023
+Lab 1, Probabilistic sketches
+Fixed-size, approximate alternatives to the exact set used by
+build_word_list (HyperLogLog, for counting distinct words) and the exact
+dictionary built by build_histogram (a count-min sketch, for estimating
+the number of occurrences of a word).
+
+Both sketches hash words with BLAKE2b instead of Python's hash(), which is
+randomized for each process, so sketches built by different processes (or
+on different machines) can be merged.
+"""
+
+__author__ = 'Rama Alkhouli'
+
+import hashlib
+import math
+import sys
+from array import array
+
+from build_word_list import build_word_list
+from tokenizer import DEFAULT_TOKENIZER, Tokenizer
+from word_histogram import build_histogram
+
+
+class HyperLogLog:
+    """Estimates the number of distinct words in a stream of words, using
+    2 ** precision one-byte registers. The relative standard error of the
+    estimate is about 1.04 / sqrt(2 ** precision); e.g., 0.8% with the
+    default precision (16 KB of registers).
+    """
+
+    def __init__(self, precision: int = 14) -> None:
+        """Initialize this HyperLogLog with 2 ** precision registers.
+
+        Raises ValueError if precision isn't between 4 and 18.
+
+        >>> hll = HyperLogLog()
+        >>> hll.update(['it', 'was', 'the', 'best', 'it', 'was'])
+        >>> round(hll.estimate())
+        4
+        """
+        if not 4 <= precision <= 18:
+            raise ValueError('HyperLogLog: precision must be between 4 and 18')
+        self.precision = precision
+        self._registers = bytearray(1 << precision)
+
+    def __len__(self) -> int:
+        """Return the estimated number of distinct words, rounded."""
+        return round(self.estimate())
+
+    def add(self, word: str) -> None:
+        """Add word to this HyperLogLog."""
+        h = int.from_bytes(hashlib.blake2b(word.encode('utf-8'),
+                                           digest_size=8).digest(), 'big')
+        bits = 64 - self.precision
+        index = h >> bits
+
+        # The register records the largest "rank" seen: the position of the
+        # leftmost 1 bit in the remaining bits of the hash.
+        rank = bits - (h & ((1 << bits) - 1)).bit_length() + 1
+        if rank > self._registers[index]:
+            self._registers[index] = rank
+
+    def update(self, words) -> None:
+        """Add every word provided by the iterable words."""
+        for word in words:
+            self.add(word)
+
+    def estimate(self) -> float:
+        """Return the estimated number of distinct words that have been
+        added to this HyperLogLog.
+        """
+        m = len(self._registers)
+        alpha = 0.7213 / (1 + 1.079 / m)
+        total = 0.0
+        zeros = 0
+        for rank in self._registers:
+            total += 2.0 ** -rank
+            if rank == 0:
+                zeros += 1
+        estimate = alpha * m * m / total
+        if estimate <= 2.5 * m and zeros > 0:
+            # Small cardinalities: linear counting is more accurate.
+            estimate = m * math.log(m / zeros)
+        return estimate
+
+    def merge(self, other: 'HyperLogLog') -> None:
+        """Add all the words added to other to this HyperLogLog, so that it
+        estimates the number of distinct words in both streams.
+
+        Raises ValueError if the two HyperLogLogs have different precisions.
+        """
+        if not isinstance(other, HyperLogLog) or \
+                other.precision != self.precision:
+            raise ValueError('merge: HyperLogLogs must have the same precision')
+        self._registers = bytearray(map(max, self._registers,
+                                        other._registers))
+
+    def memory_size(self) -> int:
+        """Return the size of this HyperLogLog's registers, in bytes."""
+        return len(self._registers)
+
+
+class CountMinSketch:
+    """Estimates the number of occurrences of each word in a stream of
+    words, using a fixed table of depth rows of width counters.
+
+    An estimate is never smaller than the true count. With probability at
+    least 1 - exp(-depth), it exceeds the true count by at most
+    e / width * n, where n is the total number of words added.
+    Conservative update (only raising the counters that are below the new
+    estimate) makes the overestimates considerably smaller in practice.
+    """
+
+    def __init__(self, width: int = 1 << 16, depth: int = 4) -> None:
+        """Initialize this CountMinSketch with depth rows of width counters
+        each (the table uses 8 * width * depth bytes).
+
+        Raises ValueError if width or depth is <= 0.
+
+        >>> sketch = CountMinSketch(1024, 4)
+        >>> sketch.update(['it', 'was', 'the', 'best', 'it', 'was'])
+        >>> sketch.estimate('it')
+        2
+        """
+        if width <= 0 or depth <= 0:
+            raise ValueError('CountMinSketch: width and depth must be > 0')
+        self.width = width
+        self.depth = depth
+        self.total = 0
+        # Row i is stored in self._table[i * width:(i + 1) * width].
+        self._table = array('q', bytes(8 * width * depth))
+
+    @classmethod
+    def from_error(cls, epsilon: float, delta: float) -> 'CountMinSketch':
+        """Return a CountMinSketch whose estimates exceed the true counts by
+        at most epsilon * n with probability at least 1 - delta.
+        """
+        return cls(math.ceil(math.e / epsilon), math.ceil(math.log(1 / delta)))
+
+    def add(self, word: str, n: int = 1) -> None:
+        """Add n occurrences of word to this sketch."""
+        cells = self._cells(word)
+        table = self._table
+        new = min([table[i] for i in cells]) + n
+        for i in cells:
+            if table[i] < new:
+                table[i] = new
+        self.total += n
+
+    def update(self, words) -> None:
+        """Add every word provided by the iterable words. If words is a
+        dictionary (e.g., a histogram or a Counter), add each word as many
+        times as its value.
+        """
+        if isinstance(words, dict):
+            for word, n in words.items():
+                self.add(word, n)
+        else:
+            for word in words:
+                self.add(word)
+
+    def estimate(self, word: str) -> int:
+        """Return the estimated number of occurrences of word."""
+        table = self._table
+        return min([table[i] for i in self._cells(word)])
+
+    def merge(self, other: 'CountMinSketch') -> None:
+        """Add all the words added to other to this sketch.
+
+        Raises ValueError if the sketches don't have the same width and
+        depth.
+        """
+        if not isinstance(other, CountMinSketch) or \
+                (other.width, other.depth) != (self.width, self.depth):
+            raise ValueError('merge: sketches must have the same dimensions')
+        # Every counter of a conservatively updated sketch is at least the
+        # true count of each word that hashes to it, so the sum of two
+        # sketches' counters is still an upper bound on the combined counts.
+        self._table = array('q', map(int.__add__, self._table, other._table))
+        self.total += other.total
+
+    def memory_size(self) -> int:
+        """Return the size of this sketch's table, in bytes."""
+        return self._table.itemsize * len(self._table)
+
+    def _cells(self, word: str) -> list[int]:
+        """Return the indices in self._table of word's counter in each row.
+
+        Two 64-bit hashes h1 and h2 are combined as h1 + i * h2 to obtain
+        the hash for row i (Kirsch and Mitzenmacher's double hashing), so
+        only one hash function is evaluated per word.
+        """
+        digest = hashlib.blake2b(word.encode('utf-8'), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], 'little')
+        h2 = int.from_bytes(digest[8:], 'little') | 1
+        width = self.width
+        return [row * width + (h1 + row * h2) % width
+                for row in range(self.depth)]
+
+
+def count_distinct_words(filename: str, precision: int = 14,
+                         tokenizer: Tokenizer = None) -> HyperLogLog:
+    """Return a HyperLogLog of the words in the text file with the specified
+    filename. Its estimate() approximates len(build_word_list(filename)).
+    """
+    if tokenizer is None:
+        tokenizer = DEFAULT_TOKENIZER
+
+    hll = HyperLogLog(precision)
+    infile = open(filename, "r")
+    for text in tokenizer.chunks(infile):
+        # Adding a word more than once doesn't change a HyperLogLog, so
+        # only the distinct words of each chunk are hashed.
+        hll.update(tokenizer.count(text))
+    infile.close()
+    return hll
+
+
+def approximate_histogram(filename: str, width: int = 1 << 16, depth: int = 4,
+                          tokenizer: Tokenizer = None) -> CountMinSketch:
+    """Return a CountMinSketch of the words in the text file with the
+    specified filename. Its estimate(word) approximates
+    build_histogram(filename)[word].
+    """
+    if tokenizer is None:
+        tokenizer = DEFAULT_TOKENIZER
+
+    sketch = CountMinSketch(width, depth)
+    infile = open(filename, "r")
+    for text in tokenizer.chunks(infile):
+        sketch.update(tokenizer.count(text))
+    infile.close()
+    return sketch
+
+
+if __name__ == '__main__':
+    filename = sys.argv[1] if len(sys.argv) > 1 else 'sons_of_martha.txt'
+
+    hll = count_distinct_words(filename)
+    print('Distinct words: {0} (exact), {1:.1f} (HyperLogLog, {2} bytes)'
+          .format(len(build_word_list(filename)), hll.estimate(),
+                  hll.memory_size()))
+
+    hist = build_histogram(filename)
+    sketch = approximate_histogram(filename, 256, 4)
+    errors = [sketch.estimate(word) - n for word, n in hist.items()]
+    assert min(errors) >= 0
+    print('Count-min sketch ({0} bytes): mean overestimate {1:.3f}, max {2}'
+          .format(sketch.memory_size(), sum(errors) / len(errors),
+                  max(errors)))
@@ -0,0 +1,117 @@
+"""
+SYSC 2100 Winter 2023
+Lab 1, Part 2, Streaming word histogram
+A version of build_histogram that memory-maps the input file and tokenizes
+it in large chunks, for text files that are much bigger than two_cities.txt.
+"""
+
+__author__ = 'Rama Alkhouli'
+
+import mmap
+import os
+import re
+import sys
+import tempfile
+import time
+from collections import Counter
+
+from corpus import make_corpus
+from tokenizer import DEFAULT_TOKENIZER, Tokenizer
+from word_histogram import build_histogram
+
+# Number of bytes tokenized at a time. Each chunk is decoded and passed to
+# Tokenizer.count in one piece.
+CHUNK_SIZE = 16 * 1024 * 1024
+
+# The ASCII bytes that str.split() treats as whitespace. A chunk is only ever
+# ended immediately before one of these bytes, so a word is never split
+# across two chunks and a multi-byte UTF-8 character is never cut in half.
+_WHITESPACE = re.compile(rb'[ \t\n\r\x0b\x0c\x1c-\x1f]')
+
+
+def build_histogram_streaming(filename: str, chunk_size: int = CHUNK_SIZE,
+                              encoding: str = 'utf-8',
+                              tokenizer: Tokenizer = None) -> dict[str, int]:
+    """Return a histogram of the words in the text file with the specified
+    name. The histogram is identical to the one returned by build_histogram,
+    but the file is memory-mapped and processed chunk_size bytes at a time.
+
+    >>> hist = build_histogram_streaming('two_cities.txt')
+    >>> hist == build_histogram('two_cities.txt')
+    True
+    """
+    with open(filename, 'rb') as infile:
+        size = os.fstat(infile.fileno()).st_size
+        if size == 0:
+            # mmap can't map an empty file.
+            return {}
+        with mmap.mmap(infile.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            counts = Counter()
+            count_range(mm, 0, size, counts, chunk_size, encoding, tokenizer)
+    return dict(counts)
+
+
+def count_range(buffer, start: int, end: int, counts: Counter,
+                chunk_size: int = CHUNK_SIZE, encoding: str = 'utf-8',
+                tokenizer: Tokenizer = None) -> None:
+    """Count the words in buffer[start:end] and add them to counts.
+
+    buffer is any bytes-like object that supports slicing (typically an
+    mmap). start and end must not fall inside a word; i.e., each must be
+    0, len(buffer) or the index of a whitespace byte.
+    """
+    if tokenizer is None:
+        tokenizer = DEFAULT_TOKENIZER
+
+    pos = start
+    while pos < end:
+        stop = min(pos + chunk_size, end)
+        if stop < end:
+            # Extend the chunk to the end of the word that straddles the
+            # chunk boundary.
+            stop = find_boundary(buffer, stop, end)
+
+        tokenizer.count(str(buffer[pos:stop], encoding), counts)
+        pos = stop
+
+
+def find_boundary(buffer, pos: int, end: int) -> int:
+    """Return the index of the first whitespace byte in buffer[pos:end],
+    or end if there isn't one. A buffer can be split at the returned index
+    without splitting a word.
+    """
+    match = _WHITESPACE.search(buffer, pos, end)
+    return end if match is None else match.start()
+
+
+def _throughput(function, filename: str) -> tuple[dict, float]:
+    """Call function(filename) and return its result, together with the
+    throughput in MB/s.
+    """
+    size = os.path.getsize(filename)
+    start = time.perf_counter()
+    result = function(filename)
+    elapsed = time.perf_counter() - start
+    return result, size / (1024 * 1024) / max(elapsed, 1e-9)
+
+
+if __name__ == '__main__':
+    # Usage: python stream_histogram.py [corpus size in MB]
+    # The synthetic corpus defaults to 1 GB; it is written to a temporary
+    # directory and deleted afterwards.
+    corpus_mb = int(sys.argv[1]) if len(sys.argv) > 1 else 1024
+
+    hist, rate = _throughput(build_histogram_streaming, 'two_cities.txt')
+    assert hist == build_histogram('two_cities.txt')
+    print('two_cities.txt: {0:.1f} MB/s'.format(rate))
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        corpus = os.path.join(tmpdir, 'corpus.txt')
+        make_corpus(corpus, 'sons_of_martha.txt', corpus_mb * 1024 * 1024)
+        hist, rate = _throughput(build_histogram_streaming, corpus)
+        print('{0} MB synthetic corpus: {1:.1f} MB/s (streaming)'.format(
+            corpus_mb, rate))
+        expected, rate = _throughput(build_histogram, corpus)
+        print('{0} MB synthetic corpus: {1:.1f} MB/s (build_histogram)'.format(
+            corpus_mb, rate))
+        assert hist == expected
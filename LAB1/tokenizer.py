@@ -0,0 +1,190 @@
+"""
+SYSC 2100 Winter 2023
+Lab 1, Tokenizer
+Splits text into normalized words. This is the split/strip/lower loop that
+build_word_list, build_histogram and build_concordance all use, written so
+that most of the work is done by str methods on whole lines or chunks of
+text instead of by Python code that runs once per word.
+"""
+
+__author__ = 'Rama Alkhouli'
+
+import string
+import time
+from collections import Counter
+from itertools import repeat
+
+# The number of characters read from a file at a time by Tokenizer.chunks.
+CHUNK_SIZE = 1024 * 1024
+
+
+class Tokenizer:
+    """A configurable word tokenizer.
+
+    By default, a word is a run of non-whitespace characters with any
+    leading or trailing punctuation (string.punctuation) removed, converted
+    to lower case; empty words are discarded. This is exactly what
+    word.strip(string.punctuation).lower() does for each word in
+    line.split().
+
+    Options:
+    - casefold: use str.casefold instead of str.lower, so that, e.g.,
+      'Straße' and 'STRASSE' are the same word;
+    - keep_apostrophes: don't strip leading or trailing apostrophes, so
+      "'tis" and "o'" keep their apostrophes;
+    - numbers: if False, discard words that consist entirely of numeric
+      characters (e.g., '1859').
+    """
+
+    def __init__(self, casefold: bool = False, keep_apostrophes: bool = False,
+                 numbers: bool = True) -> None:
+        """Initialize this Tokenizer with the specified options.
+
+        >>> tokenizer = Tokenizer()
+        >>> tokenizer.tokenize('It was the best of times, it was...')
+        ['it', 'was', 'the', 'best', 'of', 'times', 'it', 'was']
+        """
+        # The options are read-only (see the properties below), because
+        # _strip_chars and _fold are derived from them here, and settings()
+        # is used as a cache key.
+        self._casefold = casefold
+        self._keep_apostrophes = keep_apostrophes
+        self._numbers = numbers
+
+        self._strip_chars = string.punctuation
+        if keep_apostrophes:
+            self._strip_chars = self._strip_chars.replace("'", '')
+        self._fold = str.casefold if casefold else str.lower
+
+    def __repr__(self) -> str:
+        """Return the canonical string representation of this Tokenizer."""
+        return '{0}(casefold={1}, keep_apostrophes={2}, numbers={3})'.format(
+            self.__class__.__name__, self.casefold, self.keep_apostrophes,
+            self.numbers)
+
+    def __eq__(self, other: 'Tokenizer') -> bool:
+        """Return True if other is a Tokenizer with the same options as this
+        Tokenizer; otherwise return False.
+        """
+        if not isinstance(other, Tokenizer):
+            return False
+        return self.settings() == other.settings()
+
+    def __hash__(self) -> int:
+        """Return a hash value consistent with __eq__."""
+        return hash(self.settings())
+
+    @property
+    def casefold(self) -> bool:
+        """True if words are converted with str.casefold."""
+        return self._casefold
+
+    @property
+    def keep_apostrophes(self) -> bool:
+        """True if leading and trailing apostrophes are kept."""
+        return self._keep_apostrophes
+
+    @property
+    def numbers(self) -> bool:
+        """True if words that are entirely numeric are kept."""
+        return self._numbers
+
+    def settings(self) -> tuple[bool, bool, bool]:
+        """Return this Tokenizer's options as a tuple (casefold,
+        keep_apostrophes, numbers). Two tokenizers with the same settings
+        extract the same words from any text.
+        """
+        return (self.casefold, self.keep_apostrophes, self.numbers)
+
+    def tokenize(self, text: str) -> list[str]:
+        """Return a list of the words in text, in the order in which they
+        occur.
+        """
+        # Lower-case (or case-fold) the whole text at once. This gives the
+        # same words as lower-casing each word after it is stripped, because
+        # neither method changes whitespace or ASCII punctuation.
+        # map() with a str method runs the strip loop in C.
+        words = map(str.strip, self._fold(text).split(),
+                    repeat(self._strip_chars))
+        if self._numbers:
+            return [word for word in words if word != '']
+        return [word for word in words if word != '' and not word.isnumeric()]
+
+    def count(self, text: str, counts: Counter = None) -> Counter:
+        """Add the number of occurrences of each word in text to counts
+        (a new Counter, if counts is None) and return counts.
+        """
+        if counts is None:
+            counts = Counter()
+
+        # Count the raw (unstripped) tokens first; Counter does this in C.
+        # Each distinct raw token is then normalized only once, no matter
+        # how many times it occurs.
+        strip_chars = self._strip_chars
+        fold = self._fold
+        numbers = self._numbers
+        for token, n in Counter(text.split()).items():
+            word = fold(token.strip(strip_chars))
+            if word != '' and (numbers or not word.isnumeric()):
+                counts[word] += n
+        return counts
+
+    def vocabulary(self, text: str, words: set = None) -> set[str]:
+        """Add the distinct words in text to the set words (a new set, if
+        words is None) and return the set.
+        """
+        if words is None:
+            words = set()
+        words.update(self.count(text))
+        return words
+
+    def chunks(self, infile) -> 'generator':
+        """Return a generator that reads the text file object infile in
+        chunks of about CHUNK_SIZE characters. Each chunk consists of whole
+        lines, so no word is split between two chunks.
+        """
+        while True:
+            lines = infile.readlines(CHUNK_SIZE)
+            if not lines:
+                return
+            yield ''.join(lines)
+
+
+# The tokenizer used when a LAB1 function isn't passed one.
+DEFAULT_TOKENIZER = Tokenizer()
+
+
+def _per_word_loop(text: str) -> Counter:
+    """The original LAB1 tokenizer loop, for comparison."""
+    counts = Counter()
+    for line in text.splitlines():
+        for word in line.split():
+            word = word.strip(string.punctuation).lower()
+            if word != '':
+                counts[word] += 1
+    return counts
+
+
+if __name__ == '__main__':
+    # Micro-benchmark: the per-word loop vs. Tokenizer.tokenize and
+    # Tokenizer.count, on sons_of_martha.txt repeated 2000 times (~5 MB).
+    with open('sons_of_martha.txt') as infile:
+        text = infile.read() * 2000
+
+    def timed(function):
+        start = time.perf_counter()
+        result = function(text)
+        return result, time.perf_counter() - start
+
+    expected, loop_time = timed(_per_word_loop)
+    words, tokenize_time = timed(DEFAULT_TOKENIZER.tokenize)
+    counts, count_time = timed(DEFAULT_TOKENIZER.count)
+    assert Counter(words) == expected
+    assert counts == expected
+
+    size = len(text) / (1024 * 1024)
+    for name, elapsed in [('per-word loop', loop_time),
+                          ('Tokenizer.tokenize', tokenize_time),
+                          ('Tokenizer.count', count_time)]:
+        print('{0:20} {1:8.3f} s {2:8.1f} MB/s'.format(name, elapsed,
+                                                       size / elapsed))
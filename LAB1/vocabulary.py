@@ -0,0 +1,278 @@
+"""
+SYSC 2100 Winter 2023
+Lab 1, Integer-encoded vocabulary
+A compact alternative to the dict[str, int] histogram returned by
+build_histogram (and the dict[str, array] returned by build_concordance)
+for very large vocabularies. Each word is interned to a dense integer id,
+and counts (and line numbers) are stored in arrays indexed by id instead of
+in dictionaries of boxed ints.
+
+NumPy is used, if it is installed, to vectorize top_k and the frequency
+filters. Without NumPy, the same results are computed in pure Python.
+"""
+
+__author__ = 'Rama Alkhouli'
+
+import heapq
+import sys
+from array import array
+
+from tokenizer import DEFAULT_TOKENIZER, Tokenizer
+from word_histogram import build_histogram
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+class Vocabulary:
+    """A set of words, each identified by a dense integer id (0, 1, 2, ...),
+    with an occurrence count and, optionally, a list of line numbers for
+    each word.
+
+    While words are being added, a dictionary maps each word to its id.
+    compact() then sorts the words and packs them into a single bytes
+    object; ids become the words' positions in sorted order, and the
+    dictionary (and its str and int objects) is discarded. A compacted
+    Vocabulary can be queried but no new words can be added.
+    """
+
+    def __init__(self) -> None:
+        """Initialize this Vocabulary to be empty.
+
+        >>> vocab = Vocabulary()
+        >>> for word in ['it', 'was', 'the', 'best', 'of', 'times', 'it']:
+        ...     vocab.add(word)
+        ...
+        >>> vocab.count('it')
+        2
+        """
+        self._ids = {}            # word -> id (until compacted)
+        self._words = []          # id -> word (until compacted)
+        self._counts = array('q')   # id -> number of occurrences
+        self._lines = []          # id -> array of line numbers
+
+        # After compact(): the UTF-8 encoded words in sorted order, back to
+        # back, and the offset of each word in the bytes object (with an
+        # extra offset at the end).
+        self._blob = None
+        self._offsets = None
+
+    def __len__(self) -> int:
+        """Return the number of distinct words in this Vocabulary."""
+        return len(self._counts)
+
+    def __contains__(self, word: str) -> bool:
+        """Return True if word is in this Vocabulary; otherwise False."""
+        return self.id_of(word) >= 0
+
+    def encode(self, word: str) -> int:
+        """Return the id of word, adding the word to this Vocabulary if it
+        isn't already in it.
+
+        Raises ValueError if a new word is added to a compacted Vocabulary.
+        """
+        if self._blob is not None:
+            word_id = self.id_of(word)
+            if word_id < 0:
+                raise ValueError('encode: vocabulary has been compacted')
+            return word_id
+        word_id = self._ids.get(word)
+        if word_id is None:
+            word_id = len(self._counts)
+            self._ids[word] = word_id
+            self._words.append(word)
+            self._counts.append(0)
+            self._lines.append(None)
+        return word_id
+
+    def add(self, word: str, n: int = 1) -> None:
+        """Count n occurrences of word."""
+        self._counts[self.encode(word)] += n
+
+    def add_line(self, words: list[str], line_no: int) -> None:
+        """Count the words on line number line_no and record the line number
+        for each of them. Lines must be added in ascending order.
+        """
+        for word in words:
+            word_id = self.encode(word)
+            self._counts[word_id] += 1
+            lines = self._lines[word_id]
+            if lines is None:
+                self._lines[word_id] = array('I', [line_no])
+            elif lines[-1] != line_no:
+                lines.append(line_no)
+
+    def id_of(self, word: str) -> int:
+        """Return the id of word, or -1 if the word isn't in this
+        Vocabulary.
+        """
+        if self._blob is None:
+            return self._ids.get(word, -1)
+
+        # Binary search of the sorted, packed words.
+        key = word.encode('utf-8')
+        lo = 0
+        hi = len(self._counts) - 1
+        while lo <= hi:
+            mid = (lo + hi) // 2
+            term = self._blob[self._offsets[mid]:self._offsets[mid + 1]]
+            if term == key:
+                return mid
+            if term < key:
+                lo = mid + 1
+            else:
+                hi = mid - 1
+        return -1
+
+    def word(self, word_id: int) -> str:
+        """Return the word with the specified id."""
+        if self._blob is None:
+            return self._words[word_id]
+        return str(self._blob[self._offsets[word_id]:
+                              self._offsets[word_id + 1]], 'utf-8')
+
+    def count(self, word: str) -> int:
+        """Return the number of occurrences of word (0 if the word isn't in
+        this Vocabulary).
+        """
+        word_id = self.id_of(word)
+        return self._counts[word_id] if word_id >= 0 else 0
+
+    def lines(self, word: str) -> list[int]:
+        """Return the list of line numbers recorded for word by add_line."""
+        word_id = self.id_of(word)
+        if word_id < 0 or self._lines[word_id] is None:
+            return []
+        return self._lines[word_id].tolist()
+
+    def compact(self) -> None:
+        """Sort the words, pack them into a single bytes object and discard
+        the word -> id dictionary. Ids are renumbered in sorted order.
+        """
+        if self._blob is not None:
+            return
+        encoded = sorted((word.encode('utf-8'), word_id)
+                         for word_id, word in enumerate(self._words))
+        offsets = array('q', [0])
+        for key, _ in encoded:
+            offsets.append(offsets[-1] + len(key))
+        self._blob = b''.join([key for key, _ in encoded])
+        self._offsets = offsets
+
+        order = [word_id for _, word_id in encoded]
+        self._counts = array('q', [self._counts[i] for i in order])
+        self._lines = [self._lines[i] for i in order]
+        self._ids = {}
+        self._words = []
+
+    def to_dict(self) -> dict[str, int]:
+        """Return this Vocabulary as a histogram dictionary, like the one
+        returned by build_histogram.
+        """
+        return {self.word(i): self._counts[i] for i in range(len(self))}
+
+    def top_k(self, k: int) -> list[tuple[str, int]]:
+        """Return a list of (word, count) tuples for the k most frequently
+        occurring words, most frequent first.
+        """
+        k = min(k, len(self))
+        if k <= 0:
+            return []
+        if np is not None:
+            counts = np.frombuffer(self._counts, dtype=np.int64)
+            ids = np.argpartition(counts, len(counts) - k)[-k:]
+            ids = ids[np.argsort(-counts[ids], kind='stable')].tolist()
+        else:
+            ids = heapq.nlargest(k, range(len(self)),
+                                 key=self._counts.__getitem__)
+        return [(self.word(i), self._counts[i]) for i in ids]
+
+    def words_with_frequency(self, low: int, high: int = None) -> list[str]:
+        """Return a list of the words that occur at least low and at most
+        high times (exactly low times, if high is None).
+
+        If the Vocabulary has been compacted, the list is sorted in
+        ascending order.
+        """
+        if high is None:
+            high = low
+        if np is not None:
+            counts = np.frombuffer(self._counts, dtype=np.int64)
+            ids = np.flatnonzero((counts >= low) & (counts <= high)).tolist()
+        else:
+            ids = [i for i, n in enumerate(self._counts) if low <= n <= high]
+        return [self.word(i) for i in ids]
+
+    def memory_size(self) -> int:
+        """Return the approximate number of bytes used by this Vocabulary's
+        words, ids and counts (excluding line numbers).
+        """
+        size = sys.getsizeof(self._counts)
+        if self._blob is not None:
+            return size + sys.getsizeof(self._blob) + \
+                sys.getsizeof(self._offsets)
+        size += sys.getsizeof(self._ids) + sys.getsizeof(self._words)
+        for word, word_id in self._ids.items():
+            size += sys.getsizeof(word) + _int_size(word_id)
+        return size
+
+
+def build_vocabulary(filename: str, tokenizer: Tokenizer = None,
+                     lines: bool = False) -> Vocabulary:
+    """Return a compacted Vocabulary of the words in the text file with the
+    specified filename. Its counts are the same as those in the histogram
+    returned by build_histogram. If lines is True, the line numbers on which
+    each word occurs are also recorded, as in build_concordance.
+    """
+    if tokenizer is None:
+        tokenizer = DEFAULT_TOKENIZER
+
+    vocab = Vocabulary()
+    infile = open(filename, "r")
+    if lines:
+        line_no = 0
+        for line in infile:
+            line_no += 1
+            vocab.add_line(tokenizer.tokenize(line), line_no)
+    else:
+        for text in tokenizer.chunks(infile):
+            for word, n in tokenizer.count(text).items():
+                vocab.add(word, n)
+    infile.close()
+    vocab.compact()
+    return vocab
+
+
+def memory_report(hist: dict[str, int], vocab: Vocabulary) -> dict[str, int]:
+    """Return a dictionary comparing the approximate number of bytes used by
+    a histogram dictionary and by the equivalent Vocabulary.
+    """
+    dict_bytes = sys.getsizeof(hist)
+    for word, n in hist.items():
+        dict_bytes += sys.getsizeof(word) + _int_size(n)
+    encoded_bytes = vocab.memory_size()
+    return {'words': len(hist),
+            'dict_bytes': dict_bytes,
+            'encoded_bytes': encoded_bytes,
+            'saved_bytes': dict_bytes - encoded_bytes}
+
+
+def _int_size(n: int) -> int:
+    """Return the size of the int object n, or 0 if CPython shares a single
+    cached object for n (-5 <= n <= 256).
+    """
+    return 0 if -5 <= n <= 256 else sys.getsizeof(n)
+
+
+if __name__ == '__main__':
+    filename = sys.argv[1] if len(sys.argv) > 1 else 'sons_of_martha.txt'
+
+    hist = build_histogram(filename)
+    vocab = build_vocabulary(filename)
+    assert vocab.to_dict() == hist
+    print('Top 5:', vocab.top_k(5))
+    print('Words with frequency 5:', vocab.words_with_frequency(5))
+    for key, value in memory_report(hist, vocab).items():
+        print('{0:>14}: {1}'.format(key, value))
@@ -8,15 +8,14 @@ abstract data types.
 __author__ = 'Rama Alkhouli'
 
 
-import string
+import heapq
+from collections import Counter
 
-# For information about the string module, type help(string) at the shell
-# prompt, or browse "The Python Standard Library", Section "Built-in Types",
-# Subsection "Text Sequence Type - str" in the Python documentation
-# (available @ python.org).
+from tokenizer import DEFAULT_TOKENIZER, Tokenizer
 
 
-def build_histogram(filename: str) -> dict[str, int]:
+def build_histogram(filename: str,
+                    tokenizer: Tokenizer = None) -> dict[str, int]:
     """Return a histogram of the words in the text file with the specified name.
 
     The histogram is a collection of counters. Each counter keeps track of the
@@ -26,61 +25,30 @@ def build_histogram(filename: str) -> dict[str, int]:
     file. The value associated with each key is the number of occurrences of
     that word.
 
+    The words are extracted by tokenizer (by default, a Tokenizer that
+    removes any leading or trailing punctuation and converts each word to
+    lower case).
+
     >>> hist = build_histogram('sons_of_martha.txt')
     >>> hist
     >>> len(hist)  # How many different words are in the file?
     """
+    if tokenizer is None:
+        tokenizer = DEFAULT_TOKENIZER
+
     infile = open(filename, "r")
-    hist = {}
-
-    for line in infile:
-
-        # Split each line into a list of words.
-        # By default, the split method removes all whitespace; e.g.,
-        # '  Hello,    world!   '.split() returns this list:
-        #
-        #    ['Hello,', 'world!']
-        #
-        # and not:
-        #
-        #    ['  Hello,', '    world!   ']
-        #
-        # Notice that the punctuation marks have not been removed.
-
-        word_list = line.split()
-
-        # For each word, first remove any leading or trailing punctuation,
-        # then convert the the word to lower case.
-        #
-        # Examples:
-        #  'Hello,'.strip(string.punctuation) returns 'Hello'.
-        #  'Hello'.lower() returns 'hello'.
-
-        for word in word_list:
-            word = word.strip(string.punctuation).lower()
-
-            # or,
-            # word = word.strip(string.punctuation)
-            # word = word.lower()
-
-            # Increment the counter that counts the number of times
-            # word is in the file.
-            # Don't count any empty strings that are created when punctuation
-            # marks are removed.
-            # For example, if variable word is a hyphen, '-',
-            # word.strip(string.punctuation) returns the empty string, ''.
-
-            if word != '':
-                count = hist.get(word, 0)  # get returns the current count of
-                # the number of occurrences of word,
-                # or 0 if word is not yet in the
-                # dictionary.
-                hist[word] = count + 1
-
-            # or simply,
-            # hist[word] = hist.get(word, 0) + 1
+    hist = Counter()
 
-    return hist
+    for text in tokenizer.chunks(infile):
+        # Increment the counters for the words in a chunk of lines.
+        # The tokenizer doesn't count any empty strings that are created
+        # when punctuation marks are removed.
+        tokenizer.count(text, hist)
+
+    infile.close()
+
+    # Return an ordinary dictionary, not a Counter.
+    return dict(hist)
 
 
 def most_frequent_word(hist: dict[str, int]) -> tuple[str, int]:
@@ -117,6 +85,124 @@ def words_with_frequency(hist: dict[str, int], n: int) -> list[str]:
     return lst
 
 
+class FrequencyHistogram:
+    """A histogram of words that also keeps a reverse index from each
+    frequency to the words with that frequency, so that words_with_frequency
+    queries don't have to scan every word in the histogram.
+    """
+
+    def __init__(self, iterable=[]) -> None:
+        """Initialize this FrequencyHistogram.
+
+        If no iterable is provided, the new histogram is empty.
+        Otherwise, count each of the words provided by the iterable.
+
+        >>> hist = FrequencyHistogram(['it', 'was', 'the', 'best', 'it'])
+        >>> hist.count('it')
+        2
+        """
+        self._counts = {}    # word -> number of occurrences
+        self._buckets = {}   # number of occurrences -> set of words
+
+        # Sorted lists of the words in self._buckets, built on demand and
+        # discarded when the corresponding bucket changes.
+        self._sorted = {}
+
+        for word in iterable:
+            self.add(word)
+
+    def __len__(self) -> int:
+        """Return the number of distinct words in this histogram."""
+        return len(self._counts)
+
+    def __contains__(self, word: str) -> bool:
+        """Return True if word is in this histogram; otherwise False."""
+        return word in self._counts
+
+    def add(self, word: str) -> None:
+        """Count one occurrence of word. Runs in O(1) time."""
+        count = self._counts.get(word, 0)
+        self._counts[word] = count + 1
+
+        if count > 0:
+            bucket = self._buckets[count]
+            bucket.remove(word)
+            if not bucket:
+                del self._buckets[count]
+            self._sorted.pop(count, None)
+
+        self._buckets.setdefault(count + 1, set()).add(word)
+        self._sorted.pop(count + 1, None)
+
+    def count(self, word: str) -> int:
+        """Return the number of occurrences of word (0 if the word isn't in
+        this histogram).
+        """
+        return self._counts.get(word, 0)
+
+    def to_dict(self) -> dict[str, int]:
+        """Return a copy of this histogram as a dictionary of word/occurrence
+        count pairs, like the one returned by build_histogram.
+        """
+        return dict(self._counts)
+
+    def words_with_frequency(self, n: int) -> list[str]:
+        """Return a list of all words that occur with frequency n, sorted in
+        ascending order.
+
+        >>> hist = build_frequency_histogram('two_cities.txt')
+        >>> hist.words_with_frequency(1)
+        ['best', 'worst']
+        """
+        return list(self._sorted_bucket(n))
+
+    def words_with_frequency_at_least(self, n: int) -> list[str]:
+        """Return a list of all words that occur n or more times, sorted in
+        ascending order.
+        """
+        return self._merge([count for count in self._buckets if count >= n])
+
+    def words_with_frequency_between(self, a: int, b: int) -> list[str]:
+        """Return a list of all words that occur at least a and at most b
+        times, sorted in ascending order.
+        """
+        return self._merge([count for count in self._buckets
+                            if a <= count <= b])
+
+    def _sorted_bucket(self, n: int) -> list[str]:
+        """Return the (cached) sorted list of the words with frequency n."""
+        words = self._sorted.get(n)
+        if words is None:
+            words = sorted(self._buckets.get(n, ()))
+            self._sorted[n] = words
+        return words
+
+    def _merge(self, counts: list[int]) -> list[str]:
+        """Return the sorted list of the words whose frequencies are in
+        counts. Only the distinct frequencies are examined; the words are
+        merged from the sorted buckets.
+        """
+        return list(heapq.merge(*[self._sorted_bucket(n) for n in counts]))
+
+
+def build_frequency_histogram(filename: str, tokenizer: Tokenizer = None
+                              ) -> FrequencyHistogram:
+    """Return a FrequencyHistogram of the words in the text file with the
+    specified name. The words and counts are the same as in the histogram
+    returned by build_histogram.
+    """
+    if tokenizer is None:
+        tokenizer = DEFAULT_TOKENIZER
+
+    hist = FrequencyHistogram()
+    infile = open(filename, "r")
+    for text in tokenizer.chunks(infile):
+        for word in tokenizer.tokenize(text):
+            hist.add(word)
+    infile.close()
+    return hist
+
+
 if __name__ == '__main__':
     # Build and display a histogram of the distinct words in a file
     filename = 'sons_of_martha.txt'
@@ -0,0 +1,256 @@
+"""
+SYSC 2100 Winter 2023
+Lab 1, Part 1, Word lookup
+Prefix, wildcard and fuzzy (edit-distance) searches over a sorted word list,
+such as the one returned by build_word_list, without scanning the whole
+list.
+"""
+
+__author__ = 'Rama Alkhouli'
+
+import bisect
+import random
+import string
+import sys
+import time
+
+from build_word_list import build_word_list
+
+
+class WordIndex:
+    """A lookup structure for a list of distinct words.
+
+    Prefix queries use binary search over the sorted list. Wildcard and
+    fuzzy queries walk a radix tree (a compressed trie: chains of nodes with
+    one child are merged into a single edge labelled with a string), pruning
+    every subtree that can't contain a match.
+    """
+
+    class _Node:
+        __slots__ = ('children', 'word')
+
+        def __init__(self) -> None:
+            """Initialize this node with no children. If a word ends at this
+            node, self.word is the word; otherwise it is None.
+            """
+            # first character of edge label -> (edge label, child node)
+            self.children = {}
+            self.word = None
+
+    def __init__(self, words=[]) -> None:
+        """Initialize this WordIndex with the words provided by the iterable.
+        Duplicate words are ignored.
+
+        >>> index = WordIndex(build_word_list('sons_of_martha.txt'))
+        >>> index.prefix('ma')
+        ['main', 'make', 'martha', "martha's", 'mary', "mary's", 'matter', 'may']
+        """
+        self._words = sorted(set(words))
+        self._root = WordIndex._Node()
+
+        # Inserting the words in ascending order keeps every node's children
+        # in ascending order, so searches report words in ascending order.
+        for word in self._words:
+            self._insert(word)
+
+    def __len__(self) -> int:
+        """Return the number of words in this WordIndex."""
+        return len(self._words)
+
+    def __contains__(self, word: str) -> bool:
+        """Return True if word is in this WordIndex; otherwise False."""
+        i = bisect.bisect_left(self._words, word)
+        return i < len(self._words) and self._words[i] == word
+
+    def prefix(self, prefix: str) -> list[str]:
+        """Return a list of the words that start with prefix, in ascending
+        order. Takes O(log n + k) time for k matches.
+        """
+        lo, hi = self.prefix_range(prefix)
+        return self._words[lo:hi]
+
+    def prefix_range(self, prefix: str) -> tuple[int, int]:
+        """Return the range (lo, hi) of indices of the sorted word list that
+        hold the words starting with prefix.
+        """
+        lo = bisect.bisect_left(self._words, prefix)
+        # Every word that starts with prefix is less than prefix followed by
+        # the largest code point.
+        hi = bisect.bisect_left(self._words, prefix + '\U0010ffff', lo)
+        return (lo, hi)
+
+    def wildcard(self, pattern: str) -> list[str]:
+        """Return a list of the words that match pattern, in ascending order.
+        In the pattern, '?' matches any single character and '*' matches any
+        sequence of characters (including none).
+
+        >>> index = WordIndex(build_word_list('sons_of_martha.txt'))
+        >>> index.wildcard('m?r*')
+        ['martha', "martha's", 'mary', "mary's", 'mercies', 'more']
+        """
+        result = []
+        start = _closure(pattern, frozenset([0]))
+
+        # The sets of pattern positions are the states of a DFA that is
+        # built lazily: each transition is computed once per query and then
+        # looked up in transitions.
+        transitions = {}
+        self._wildcard(self._root, pattern, start, transitions, result)
+        return result
+
+    def fuzzy(self, word: str, max_distance: int) -> list[tuple[str, int]]:
+        """Return a list of (word, distance) tuples for every word whose
+        Levenshtein (edit) distance from word is at most max_distance,
+        sorted by distance, then by word.
+
+        >>> index = WordIndex(build_word_list('sons_of_martha.txt'))
+        >>> index.fuzzy('marta', 1)
+        [('martha', 1)]
+        """
+        result = []
+        # Row i of the dynamic-programming table holds the distances between
+        # word[:j] (for each j) and the first i characters on the path from
+        # the root.
+        first_row = list(range(len(word) + 1))
+        self._fuzzy(self._root, word, first_row, max_distance, result)
+        result.sort(key=lambda t: (t[1], t[0]))
+        return result
+
+    def _insert(self, word: str) -> None:
+        """Insert word into the radix tree."""
+        node = self._root
+        i = 0
+        while i < len(word):
+            edge = node.children.get(word[i])
+            if edge is None:
+                leaf = WordIndex._Node()
+                leaf.word = word
+                node.children[word[i]] = (word[i:], leaf)
+                return
+            label, child = edge
+
+            # Length of the common prefix of the label and the rest of word.
+            k = 0
+            while k < len(label) and i + k < len(word) and \
+                    label[k] == word[i + k]:
+                k += 1
+            if k < len(label):
+                # Split the edge: label[:k] leads to a new node, from which
+                # label[k:] leads to the old child.
+                middle = WordIndex._Node()
+                middle.children[label[k]] = (label[k:], child)
+                node.children[word[i]] = (label[:k], middle)
+                child = middle
+            node = child
+            i += k
+        node.word = word
+
+    def _wildcard(self, node: '_Node', pattern: str, states: frozenset,
+                  transitions: dict, result: list[str]) -> None:
+        """Append to result the words in the subtree rooted at node that
+        match pattern, given the set of pattern positions (states) that the
+        path to node can be in.
+        """
+        if node.word is not None and len(pattern) in states:
+            result.append(node.word)
+        for label, child in node.children.values():
+            next_states = states
+            for ch in label:
+                key = (next_states, ch)
+                if key in transitions:
+                    next_states = transitions[key]
+                else:
+                    next_states = transitions[key] = \
+                        _step(pattern, next_states, ch)
+                if not next_states:
+                    break
+            else:
+                self._wildcard(child, pattern, next_states, transitions,
+                               result)
+
+    def _fuzzy(self, node: '_Node', word: str, row: list[int],
+               max_distance: int, result: list[tuple[str, int]]) -> None:
+        """Append to result the words in the subtree rooted at node that are
+        within max_distance of word, given the last row of the distance
+        table for the path to node.
+        """
+        if node.word is not None and row[-1] <= max_distance:
+            result.append((node.word, row[-1]))
+        for label, child in node.children.values():
+            next_row = row
+            for ch in label:
+                next_row = _next_row(word, next_row, ch)
+                # The distance can only grow along the path, so the subtree
+                # can be skipped once every entry exceeds the limit.
+                if min(next_row) > max_distance:
+                    break
+            else:
+                self._fuzzy(child, word, next_row, max_distance, result)
+
+
+def _closure(pattern: str, states: frozenset) -> frozenset:
+    """Return states plus every pattern position reachable from them by
+    letting a '*' match the empty string.
+    """
+    closed = set(states)
+    for s in states:
+        while s < len(pattern) and pattern[s] == '*':
+            s += 1
+            closed.add(s)
+    return frozenset(closed)
+
+
+def _step(pattern: str, states: frozenset, ch: str) -> frozenset:
+    """Return the set of pattern positions reached from states by matching
+    the character ch.
+    """
+    next_states = set()
+    for s in states:
+        if s < len(pattern):
+            p = pattern[s]
+            if p == '*':
+                next_states.add(s)
+            elif p == '?' or p == ch:
+                next_states.add(s + 1)
+    return _closure(pattern, next_states) if next_states else frozenset()
+
+
+def _next_row(word: str, row: list[int], ch: str) -> list[int]:
+    """Return the next row of the Levenshtein distance table, after the
+    character ch is appended to the path.
+    """
+    left = row[0] + 1
+    next_row = [left]
+    for j, wc in enumerate(word):
+        distance = row[j] if wc == ch else row[j] + 1   # substitution
+        if row[j + 1] + 1 < distance:                   # deletion
+            distance = row[j + 1] + 1
+        if left + 1 < distance:                         # insertion
+            distance = left + 1
+        next_row.append(distance)
+        left = distance
+    return next_row
+
+
+if __name__ == '__main__':
+    # Usage: python word_lookup.py [number of random words]
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    rng = random.Random(2100)
+    words = set(build_word_list('sons_of_martha.txt'))
+    while len(words) < n:
+        words.add(''.join(rng.choices(string.ascii_lowercase,
+                                      k=rng.randint(3, 12))))
+
+    start = time.perf_counter()
+    index = WordIndex(words)
+    print('Built index of {0} words in {1:.2f} s'.format(
+        len(index), time.perf_counter() - start))
+
+    for name, query in [('prefix', lambda: index.prefix('mart')),
+                        ('wildcard', lambda: index.wildcard('m?rt*a')),
+                        ('fuzzy', lambda: index.fuzzy('martha', 1))]:
+        start = time.perf_counter()
+        result = query()
+        elapsed = time.perf_counter() - start
+        print('{0:>8}: {1} matches in {2:.3f} ms'.format(
+            name, len(result), elapsed * 1000))
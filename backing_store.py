@@ -0,0 +1,225 @@
+# SYSC 2100 Winter 2023
+
+# Backing arrays for the array-based containers (ArrayBag, ArrayList and
+# BoundedPriorityQueue). Each container used to have its own copy of a
+# _new_array function that created a ctypes array of Python object
+# references and then set every element to None in a Python loop, so every
+# resize paid for an extra interpreted pass over the new array.
+#
+# new_array sets all the elements with one slice assignment, which runs in
+# C, and the ctypes array types are cached by capacity. Optionally, arrays
+# that the containers release when they resize can be recycled through an
+# ArrayPool, which keeps free arrays in separate lists for each capacity.
+
+import ctypes
+import functools
+import sys
+import time
+
+__author__ = 'Rama Alkhouli'
+
+# The pool used by new_array and release, or None if arrays aren't recycled.
+_pool = None
+
+
+@functools.lru_cache(maxsize=256)
+def array_type(capacity: int) -> type:
+    """Return the ctypes array type for arrays of capacity Python object
+    references. The types are cached, so each one is created once.
+    """
+    return ctypes.py_object * capacity
+
+
+def new_array(capacity: int) -> 'py_object_Array_<capacity>':
+    """Return a new array with the specified capacity that stores
+    references to Python objects. All elements are initialized to None.
+
+    If a pool has been enabled (see enable_pool), an array with this
+    capacity is taken from the pool, if it has one.
+
+    Raises ValueError if capacity is <= 0.
+
+    >>> arr = new_array(10)
+    >>> len(arr)
+    10
+    >>> arr[0], arr[9]
+    (None, None)
+    """
+    if capacity <= 0:
+        raise ValueError('new_array: capacity must be > 0')
+    if _pool is not None:
+        return _pool.acquire(capacity)
+    return _allocate(capacity)
+
+
+def release(arr: 'py_object_Array_<capacity>') -> None:
+    """Give arr back to the backing store, so that it can be recycled if a
+    pool has been enabled. Otherwise, release does nothing.
+
+    The caller must own arr: nothing else may refer to it (e.g., an
+    iterator over a container's old backing array), because its elements
+    are overwritten when it is recycled.
+    """
+    if _pool is not None:
+        _pool.put(arr)
+
+
+def enable_pool(pool: 'ArrayPool' = None) -> 'ArrayPool':
+    """Make new_array and release use pool (by default, a new ArrayPool)
+    and return it.
+    """
+    global _pool
+    if pool is None:
+        pool = ArrayPool()
+    _pool = pool
+    return pool
+
+
+def disable_pool() -> None:
+    """Stop recycling arrays. The arrays held by the current pool are
+    freed.
+    """
+    global _pool
+    if _pool is not None:
+        _pool.clear()
+    _pool = None
+
+
+class ArrayPool:
+    """A cache of unused backing arrays, with a list of free arrays for each
+    capacity. Every array in the pool has all its elements set to None.
+    """
+
+    def __init__(self, max_slots: int = 1 << 22) -> None:
+        """Initialize this ArrayPool to be empty. At most max_slots elements
+        (in total, over all the arrays) are kept in the pool; arrays that
+        would exceed this limit are freed instead.
+
+        Raises ValueError if max_slots is negative.
+        """
+        if max_slots < 0:
+            raise ValueError('ArrayPool: max_slots must be >= 0')
+        self.max_slots = max_slots
+        self.hits = 0
+        self.misses = 0
+        self._free = {}     # capacity -> list of free arrays
+        self._slots = 0     # total capacity of the free arrays
+
+    def __len__(self) -> int:
+        """Return the number of arrays in this pool."""
+        return sum([len(arrays) for arrays in self._free.values()])
+
+    def acquire(self, capacity: int) -> 'py_object_Array_<capacity>':
+        """Return an array with the specified capacity whose elements are
+        all None: a free array from this pool, if there is one; otherwise, a
+        new array.
+        """
+        arrays = self._free.get(capacity)
+        if arrays:
+            self.hits += 1
+            self._slots -= capacity
+            return arrays.pop()
+        self.misses += 1
+        return _allocate(capacity)
+
+    def put(self, arr: 'py_object_Array_<capacity>') -> None:
+        """Add arr, which must no longer be used, to this pool. Its elements
+        are reset to None, so the objects it refers to can be freed. If
+        adding arr would take the pool over max_slots, it isn't kept.
+        """
+        capacity = len(arr)
+        if self._slots + capacity > self.max_slots:
+            return
+        arr[0:capacity] = [None] * capacity
+        # Storing None in an element doesn't drop the reference that ctypes
+        # keeps (in the array's _objects dictionary) to the object that was
+        # stored there before, so those references are dropped here.
+        if arr._objects is not None:
+            arr._objects.clear()
+        self._free.setdefault(capacity, []).append(arr)
+        self._slots += capacity
+
+    def clear(self) -> None:
+        """Remove all the arrays from this pool."""
+        self._free = {}
+        self._slots = 0
+
+
+def _allocate(capacity: int) -> 'py_object_Array_<capacity>':
+    """Return a new array of the specified capacity, filled with None."""
+    arr = array_type(capacity)()
+    # The elements of a new array are NULL pointers, which can't be read.
+    arr[0:capacity] = [None] * capacity
+    return arr
+
+
+def _loop_new_array(capacity: int) -> 'py_object_Array_<capacity>':
+    """Return a new array filled with None the way the containers' copies of
+    _new_array used to: by setting each element in a Python loop. Used by
+    the benchmark below.
+    """
+    PyCArrayType = ctypes.py_object * capacity
+    a = PyCArrayType()
+    for i in range(len(a)):
+        a[i] = None
+    return a
+
+
+if __name__ == '__main__':
+    # Usage: python backing_store.py [number of items]
+    # Time new_array on its own, then in resize-heavy workloads: appending n
+    # items to an ArrayList and adding n items to an ArrayBag one at a time,
+    # and a bag that repeatedly grows to 4096 items and is emptied again, so
+    # it keeps resizing between the same capacities.
+    import backing_store as store
+    from lab3_arraybag import ArrayBag
+    from lab4_arraylist import ArrayList
+
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 10 ** 6
+
+    def allocate():
+        capacity = 1
+        while capacity < n:
+            store.new_array(capacity)
+            capacity *= 2
+
+    def append_all():
+        lst = ArrayList()
+        for i in range(n):
+            lst.append(i)
+
+    def add_all():
+        bag = ArrayBag()
+        for i in range(n):
+            bag.add(i)
+
+    def grow_and_shrink():
+        bag = ArrayBag()
+        for _ in range(n // 4096):
+            for i in range(4096):
+                bag.add(i)
+            bag.grab_many(len(bag) - 1)
+            bag.grab()
+
+    workloads = [allocate, append_all, add_all, grow_and_shrink]
+    print('{0:<16}{1:>16}{2:>16}{3:>16}{4:>18}'.format(
+        'n = {0}'.format(n), 'new_array (s)', 'ArrayList (s)',
+        'ArrayBag (s)', 'grow/shrink (s)'))
+    new_array = store.new_array
+    for name, function, pooled in [('per-slot loop', _loop_new_array, False),
+                                   ('slice', new_array, False),
+                                   ('slice + pool', new_array, True)]:
+        store.new_array = function
+        pool = store.enable_pool() if pooled else None
+        times = []
+        for workload in workloads:
+            start = time.perf_counter()
+            workload()
+            times.append(time.perf_counter() - start)
+        store.disable_pool()
+        store.new_array = new_array
+        print('{0:<16}{1:>16.3f}{2:>16.3f}{3:>16.3f}{4:>18.3f}'.format(
+            name, *times))
+        if pool is not None:
+            print('{0:<16}{1} hits, {2} misses'.format('', pool.hits,
+                                                        pool.misses))
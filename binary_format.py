@@ -0,0 +1,198 @@
+# SYSC 2100 Winter 2023
+
+# A compact binary file format for the items of the array-backed containers
+# (ArrayBag, ArrayList and BinaryMaxHeap), used by their save, load and
+# from_buffer methods instead of repr() and eval().
+#
+# A file starts with a fixed-size header:
+#
+#     magic       4 bytes   b'DSA1'
+#     encoding    1 byte    PACKED or PICKLED
+#     typecode    1 byte    array module type code of a PACKED payload
+#     reserved    2 bytes
+#     tag         8 bytes   name of the container that saved the file
+#     count       8 bytes   number of items
+#     size        8 bytes   number of bytes in the payload
+#
+# (all integers are little-endian), followed by the payload.
+#
+# If every item is an int that fits in 64 bits, or every item is a float,
+# the payload is the items packed into a C array of type 'q' or 'd'
+# (little-endian). Otherwise, the items are pickled with pickle protocol 5.
+# Objects that support out-of-band buffers (e.g., bytearrays and NumPy
+# arrays) have their buffers stored after the pickle instead of being
+# copied into it. When a file is loaded, those buffers are memoryviews of
+# the memory-mapped file, so their data isn't copied.
+
+import array
+import mmap
+import pickle
+import struct
+import sys
+
+__author__ = 'Rama Alkhouli'
+
+MAGIC = b'DSA1'
+
+PACKED = 0
+PICKLED = 1
+
+_HEADER = struct.Struct('<4sBcxx8sQQ')
+
+# A pickled payload starts with the length of the pickle and the number of
+# out-of-band buffers, followed by the length of each buffer, the pickle and
+# the buffers. Each buffer starts at a multiple of _ALIGNMENT bytes from the
+# start of the payload.
+_PICKLE_HEADER = struct.Struct('<QQ')
+_LENGTH = struct.Struct('<Q')
+_ALIGNMENT = 8
+
+
+def save_items(filename: str, items: list, tag: str) -> None:
+    """Write items to a new binary file with the specified filename. tag (at
+    most 8 ASCII characters) identifies the kind of container being saved;
+    load_items checks it.
+    """
+    with open(filename, 'wb') as outfile:
+        for block in _encode(items, tag):
+            outfile.write(block)
+
+
+def dumps(items: list, tag: str) -> bytes:
+    """Return items encoded as bytes, in the same format as a file written
+    by save_items.
+    """
+    return b''.join(_encode(items, tag))
+
+
+def load_items(filename: str, tag: str) -> list:
+    """Return the list of items in a binary file written by save_items.
+
+    The file is memory-mapped rather than read, so a packed payload is
+    decoded straight from the operating system's page cache, and
+    out-of-band buffers in a pickled payload are not copied at all (the
+    file stays mapped for as long as the objects that use them exist).
+
+    Raises ValueError if the file isn't in this format, or was saved by a
+    different kind of container than tag.
+    """
+    with open(filename, 'rb') as infile:
+        if infile.seek(0, 2) == 0:
+            raise ValueError('load: {0} is empty'.format(filename))
+        mapped = mmap.mmap(infile.fileno(), 0, access=mmap.ACCESS_READ)
+    # The mapping isn't closed here: it is unmapped when the last memoryview
+    # of it (if any) is released.
+    return read_items(mapped, tag)
+
+
+def read_items(buffer, tag: str) -> list:
+    """Return the list of items encoded in buffer (any object that supports
+    the buffer protocol, such as bytes or an mmap), in the format written by
+    save_items.
+
+    Raises ValueError if the buffer isn't in this format, or was saved by a
+    different kind of container than tag.
+    """
+    view = memoryview(buffer).cast('B')
+    if len(view) < _HEADER.size:
+        raise ValueError('load: data is too short')
+    magic, encoding, typecode, saved_tag, count, size = \
+        _HEADER.unpack_from(view)
+    if magic != MAGIC:
+        raise ValueError('load: data is not in the binary container format')
+    if saved_tag.rstrip(b'\0') != tag.encode('ascii'):
+        raise ValueError('load: data was saved by {0}, not {1}'.format(
+            saved_tag.rstrip(b'\0').decode('ascii', 'replace'), tag))
+    payload = view[_HEADER.size:_HEADER.size + size]
+    if len(payload) != size:
+        raise ValueError('load: data is truncated')
+
+    if encoding == PACKED:
+        items = array.array(typecode.decode('ascii'))
+        if len(payload) != count * items.itemsize:
+            raise ValueError('load: payload size does not match item count')
+        items.frombytes(payload)
+        if sys.byteorder == 'big':
+            items.byteswap()
+        return items.tolist()
+
+    if encoding == PICKLED:
+        pickle_size, num_buffers = _PICKLE_HEADER.unpack_from(payload)
+        offset = _PICKLE_HEADER.size
+        lengths = []
+        for _ in range(num_buffers):
+            lengths.append(_LENGTH.unpack_from(payload, offset)[0])
+            offset += _LENGTH.size
+        data = payload[offset:offset + pickle_size]
+        offset += pickle_size
+        buffers = []
+        for length in lengths:
+            offset = _align(offset)
+            buffers.append(payload[offset:offset + length])
+            offset += length
+        items = pickle.loads(data, buffers=buffers)
+        if len(items) != count:
+            raise ValueError('load: payload size does not match item count')
+        return items
+
+    raise ValueError('load: unknown encoding {0}'.format(encoding))
+
+
+def _encode(items: list, tag: str) -> list:
+    """Return a list of bytes-like blocks that, concatenated, are items
+    encoded in the binary format.
+    """
+    tag_bytes = tag.encode('ascii')
+    if len(tag_bytes) > 8:
+        raise ValueError('save: tag must be at most 8 characters')
+
+    packed = _pack(items)
+    if packed is not None:
+        blocks = [memoryview(packed).cast('B')]
+        encoding, typecode = PACKED, packed.typecode
+    else:
+        buffers = []
+        data = pickle.dumps(items, protocol=5,
+                            buffer_callback=buffers.append)
+        raw = [b.raw() for b in buffers]
+        blocks = [_PICKLE_HEADER.pack(len(data), len(raw))]
+        blocks.extend([_LENGTH.pack(r.nbytes) for r in raw])
+        blocks.append(data)
+        offset = sum([len(b) for b in blocks])
+        for r in raw:
+            padding = _align(offset) - offset
+            blocks.append(bytes(padding))
+            blocks.append(r)
+            offset += padding + r.nbytes
+        encoding, typecode = PICKLED, 'B'
+
+    size = sum([memoryview(b).nbytes for b in blocks])
+    header = _HEADER.pack(MAGIC, encoding, typecode.encode('ascii'),
+                          tag_bytes, len(items), size)
+    return [header] + blocks
+
+
+def _pack(items: list) -> array.array:
+    """Return items packed into an array of type 'q' or 'd' (little-endian),
+    or None if the items aren't all ints that fit in 64 bits or all floats.
+    """
+    # Exact types are checked, so that bools and subclasses of int and float
+    # are pickled (and keep their types) instead of being packed.
+    types = set(map(type, items))
+    if types == {int}:
+        try:
+            packed = array.array('q', items)
+        except OverflowError:
+            return None
+    elif types == {float}:
+        packed = array.array('d', items)
+    else:
+        return None
+    if sys.byteorder == 'big':
+        packed.byteswap()
+    return packed
+
+
+def _align(offset: int) -> int:
+    """Return the smallest multiple of _ALIGNMENT that is >= offset."""
+    return (offset + _ALIGNMENT - 1) // _ALIGNMENT * _ALIGNMENT
@@ -3,6 +3,8 @@
 # higher its priority.) The remove/delete_max operations remove the
 # highest-priority element.
 
+import binary_format
+
 __author__ = 'Rama Alkhouli'
 
 
@@ -37,6 +39,9 @@ def parent(i: int) -> int:
 
 class BinaryMaxHeap:
 
+    # Identifies files written by BinaryMaxHeap.save.
+    _FORMAT_TAG = 'MaxHeap'
+
     def __init__(self, iterable=[]) -> None:
         """Initialize this BinaryMaxHeap.
 
@@ -179,6 +184,61 @@ class BinaryMaxHeap:
             raise IndexError("peek: empty heap")
         return self._elems[0]
 
+    def save(self, filename: str) -> None:
+        """Save the items in this BinaryMaxHeap to a binary file with the
+        specified filename, which can be loaded with BinaryMaxHeap.load.
+        The items are saved in the order in which they are stored in the
+        heap's array, so loading them doesn't require them to be re-heaped.
+        """
+        binary_format.save_items(filename, self._elems, self._FORMAT_TAG)
+
+    def to_bytes(self) -> bytes:
+        """Return the items in this BinaryMaxHeap encoded in the same binary
+        format as a file written by save, which can be decoded with
+        BinaryMaxHeap.from_buffer.
+        """
+        return binary_format.dumps(self._elems, self._FORMAT_TAG)
+
+    @classmethod
+    def load(cls, filename: str) -> 'BinaryMaxHeap':
+        """Return a new BinaryMaxHeap containing the items in a binary file
+        written by save. The file is memory-mapped, and its items are
+        copied into the new heap's list in bulk, not added one by one.
+
+        Raises ValueError if the file wasn't written by BinaryMaxHeap.save.
+
+        >>> heap = BinaryMaxHeap([4, 2, 6, 1, 5])
+        >>> import os, tempfile
+        >>> tmpdir = tempfile.TemporaryDirectory()
+        >>> filename = os.path.join(tmpdir.name, 'heap.bin')
+        >>> heap.save(filename)
+        >>> BinaryMaxHeap.load(filename)
+        BinaryMaxHeap([6, 5, 4, 1, 2])
+        >>> tmpdir.cleanup()
+        """
+        items = binary_format.load_items(filename, cls._FORMAT_TAG)
+        return cls._from_list(items)
+
+    @classmethod
+    def from_buffer(cls, buffer) -> 'BinaryMaxHeap':
+        """Return a new BinaryMaxHeap containing the items encoded in buffer
+        (bytes returned by to_bytes, or any object that supports the buffer
+        protocol and holds the contents of a file written by save).
+
+        Raises ValueError if the buffer doesn't hold a saved BinaryMaxHeap.
+        """
+        items = binary_format.read_items(buffer, cls._FORMAT_TAG)
+        return cls._from_list(items)
+
+    @classmethod
+    def _from_list(cls, items: list) -> 'BinaryMaxHeap':
+        """Return a new BinaryMaxHeap whose list is items, which must
+        already satisfy the heap property.
+        """
+        heap = cls()
+        heap._elems = items
+        return heap
+
 
 if __name__ == '__main__':
     index = 1
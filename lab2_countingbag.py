@@ -0,0 +1,269 @@
+# SYSC 2100 Winter 2023 Lab 2
+
+# An implementation of ADT Bag that uses an instance of Python's built-in
+# dict type as the underlying data structure. Each distinct item is a key,
+# and the value associated with the key is the number of occurrences of the
+# item (its multiplicity), so count, remove and __contains__ take O(1) time
+# instead of the O(n) time taken by ListBag.
+#
+# Items must be hashable.
+
+import random
+import sys
+import time
+
+from lab2_listbag import ListBag
+from lab3_arraybag import ArrayBag
+
+__author__ = 'Rama Alkhouli'
+
+
+class CountingBag:
+
+    def __init__(self, iterable=[]) -> None:
+        """Initialize this CountingBag.
+
+        If no iterable is provided, the new CountingBag is empty.
+        Otherwise, initialize the CountingBag by adding the values
+        provided by the iterable.
+
+        Raises TypeError if any of the values is unhashable.
+
+        >>> bag = CountingBag()
+        >>> bag
+        CountingBag([])
+        >>> bag = CountingBag([1, 4, 3, 6, 3])
+        >>> bag
+        CountingBag([1, 4, 3, 3, 6])
+        """
+        self._counts = {}    # item -> number of occurrences (always > 0)
+        self._num_items = 0  # sum of the values in self._counts
+        for item in iterable:
+            self.add(item)
+
+    def __str__(self) -> str:
+        """Return a string representation of this CountingBag.
+
+        >>> bag = CountingBag()
+        >>> str(bag)
+        '{}'
+        >>> bag = CountingBag([1, 4, 3, 6, 3])
+        >>> str(bag)
+        '{1, 4, 3, 3, 6}'
+
+        Note: All occurrences of an item are listed together, in the order
+        in which the distinct items were first added.
+        """
+        return "{{{0}}}".format(", ".join([repr(x) for x in self]))
+
+    def __repr__(self) -> str:
+        """Return the canonical string representation of this CountingBag.
+
+        >>> bag = CountingBag()
+        >>> repr(bag)
+        'CountingBag([])'
+        >>> bag = CountingBag([3, 1, 2, 3, 4])
+        >>> repr(bag)
+        'CountingBag([3, 3, 1, 2, 4])'
+        """
+        # For a CountingBag object, obj, the expression eval(repr(obj))
+        # returns a new CountingBag that is equal to obj.
+        return "{0}([{1}])".format(self.__class__.__name__,
+                                   ", ".join([repr(x) for x in self]))
+
+    def __len__(self) -> int:
+        """Return the number of items in this CountingBag.
+
+        >>> bag = CountingBag()
+        >>> len(bag)
+        0
+        >>> bag = CountingBag([1, 4, 3, 6, 3])
+        >>> len(bag)
+        5
+        """
+        return self._num_items
+
+    def __iter__(self):
+        """Return an iterator for this CountingBag. Each item is produced
+        as many times as it occurs in the bag.
+
+        >>> bag = CountingBag([3, 6, 3])
+        >>> for x in bag:
+        ...     print(x)
+        ...
+        3
+        3
+        6
+        """
+        for item, n in self._counts.items():
+            for _ in range(n):
+                yield item
+
+    def __contains__(self, item: any) -> bool:
+        """Return True if item is in this CountingBag; otherwise False.
+
+        >>> bag = CountingBag()
+        >>> 2 in bag
+        False
+        >>> bag = CountingBag([1, 4, 3, 6])
+        >>> 4 in bag
+        True
+        >>> 7 in bag
+        False
+        """
+        return item in self._counts
+
+    def add(self, item: any) -> None:
+        """Add item to this CountingBag.
+
+        Raises TypeError if item is unhashable.
+
+        >>> bag = CountingBag([1, 4, 3, 6])
+        >>> bag.add(3)
+        >>> len(bag)
+        5
+        >>> bag.count(3)
+        2
+        """
+        self._counts[item] = self._counts.get(item, 0) + 1
+        self._num_items += 1
+
+    def count(self, item: any) -> int:
+        """Return the total number of occurrences of item in this bag.
+
+        >>> bag = CountingBag([3, 1, 2, 3, 4])
+        >>> bag.count(3)
+        2
+        >>> bag.count(7)
+        0
+        """
+        return self._counts.get(item, 0)
+
+    def remove(self, item: any) -> any:
+        """Remove and return one instance of item from this CountingBag.
+
+        Raises ValueError if the bag is empty.
+        Raises ValueError if item is not in the bag.
+
+        >>> bag = CountingBag([3, 1, 2, 3, 4])
+        >>> bag.remove(3)
+        3
+        >>> bag.count(3)
+        1
+        >>> len(bag)
+        4
+        """
+        if self._num_items == 0:
+            raise ValueError("bag.remove(x): remove from empty bag")
+        n = self._counts.get(item, 0)
+        if n == 0:
+            raise ValueError("bag.remove(x): x not in bag")
+        if n == 1:
+            # Only items that are in the bag are kept as keys.
+            del self._counts[item]
+        else:
+            self._counts[item] = n - 1
+        self._num_items -= 1
+        return item
+
+    def grab(self) -> any:
+        """Remove and return a randomly selected item from this bag. Every
+        occurrence of every item is equally likely to be selected.
+
+        Takes O(d) time, where d is the number of distinct items.
+
+        Raises ValueError if the bag is empty.
+
+        >>> bag = CountingBag([3, 1, 2, 3, 4])
+        >>> bag.grab() in {1, 2, 3, 4}
+        True
+        >>> len(bag)
+        4
+        """
+        if self._num_items == 0:
+            raise ValueError("bag.grab(): grab from empty bag")
+
+        # Pick the position of one of the items, as if the items were
+        # stored in a list in the order produced by the iterator.
+        position = random.randrange(self._num_items)
+        for item, n in self._counts.items():
+            if position < n:
+                return self.remove(item)
+            position -= n
+
+    def __add__(self, other: 'CountingBag') -> 'CountingBag':
+        """Return a new CountingBag containing the concatenation of self and
+        other.
+
+        Raises TypeError if other is not a CountingBag.
+
+        >>> bag1 = CountingBag([1, 3, 5])
+        >>> bag2 = CountingBag([2, 3, 6])
+        >>> bag3 = bag1 + bag2
+        >>> repr(bag3)
+        'CountingBag([1, 3, 3, 5, 2, 6])'
+        """
+        if not isinstance(other, CountingBag):
+            raise TypeError('other must be a CountingBag')
+        bag = CountingBag()
+        bag._counts = self._counts.copy()
+        for item, n in other._counts.items():
+            bag._counts[item] = bag._counts.get(item, 0) + n
+        bag._num_items = self._num_items + other._num_items
+        return bag
+
+    def __eq__(self, other: 'CountingBag') -> bool:
+        """Return True if self is equal to the CountingBag referred to by
+        other; otherwise return False. Takes O(d) time, where d is the number
+        of distinct items.
+
+        >>> bag1 = CountingBag([1, 2, 3])
+        >>> bag2 = CountingBag([3, 2, 1])
+        >>> bag1 == bag2
+        True
+
+        >>> bag1 = CountingBag([1, 2, 3])
+        >>> bag2 = CountingBag([4, 5, 6])
+        >>> bag1 == bag2
+        False
+        """
+        if not isinstance(other, CountingBag):
+            return False
+        return self._counts == other._counts
+
+
+def _time_per_op(function, args: list) -> float:
+    """Return the mean time in microseconds taken by function(arg), for each
+    arg in args.
+    """
+    start = time.perf_counter()
+    for arg in args:
+        function(arg)
+    return (time.perf_counter() - start) / len(args) * 1e6
+
+
+if __name__ == '__main__':
+    # Usage: python lab2_countingbag.py [number of items]
+    # Compare CountingBag with ListBag and ArrayBag. Each bag holds n random
+    # items drawn from n // 10 distinct values.
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 10 ** 6
+    rng = random.Random(2100)
+    values = [rng.randrange(max(1, n // 10)) for _ in range(n)]
+
+    print('{0:>12} {1:>12} {2:>12} {3:>12} {4:>12}'.format(
+        '(us per op)', 'add', 'count', 'in', 'remove'))
+    for bag_type in [CountingBag, ListBag, ArrayBag]:
+        bag = bag_type()
+        add = _time_per_op(bag.add, values)
+
+        # The list-backed bags scan every item for each query, so they are
+        # only given a few.
+        num_queries = min(100000 if bag_type is CountingBag else 10, n)
+        queries = [rng.randrange(max(1, n // 10)) for _ in range(num_queries)]
+        count = _time_per_op(bag.count, queries)
+        contains = _time_per_op(bag.__contains__, queries)
+        remove = _time_per_op(bag.remove, values[-num_queries:])
+        assert len(bag) == n - num_queries
+
+        print('{0:>12} {1:12.3f} {2:12.3f} {3:12.3f} {4:12.3f}'.format(
+            bag_type.__name__, add, count, contains, remove))
@@ -5,6 +5,8 @@
 import random
 from typing import Any
 
+import multiset
+
 __author__ = 'Rama'
 
 
@@ -161,16 +163,20 @@ class ListBag:
         return item
         
 
-    def grab(self) -> any:
+    def grab(self, rng=random) -> any:
         """Remove and return a randomly selected item from this bag.
 
+        The item is selected by rng, which can be a random.Random object
+        (for a reproducible sequence of items) or the random module.
+        Takes O(1) time.
+
         Raises ValueError if the bag is empty.
 
         >>> bag = ListBag([3, 1, 2, 3, 4])
         >>> len(bag)
         5
 
-        >>> ListBag.grab()
+        >>> bag.grab()
         # grab will randomly select one of items stored in the bag,
         # and remove and return that value. The value displayed in the shell
         # will be one of 1, 2, 3 or 4, depending on which item was removed.
@@ -179,9 +185,69 @@ class ListBag:
         4
         """
 
-        if (self._elems == 0 ):
+        if len(self._elems) == 0:
             raise ValueError ("bag.grab(): grab from empty bag")
-        return self._elems.pop(random.randrange(len(self._elems)))
+
+        # The order of the items in a bag doesn't matter, so instead of
+        # popping the selected item (which shifts every item after it),
+        # overwrite it with the last item and pop that.
+        i = rng.randrange(len(self._elems))
+        item = self._elems[i]
+        self._elems[i] = self._elems[-1]
+        self._elems.pop()
+        return item
+
+    def grab_many(self, k: int, rng=random) -> list:
+        """Remove and return a list of k randomly selected items from this
+        bag, in O(k) time. See grab.
+
+        Raises ValueError if k is negative or greater than the number of
+        items in the bag.
+
+        >>> bag = ListBag([3, 1, 2, 3, 4])
+        >>> items = bag.grab_many(2, random.Random(2100))
+        >>> len(items), len(bag)
+        (2, 3)
+        """
+        n = len(self._elems)
+        if not 0 <= k <= n:
+            raise ValueError("bag.grab_many(k): k must be between 0 and "
+                             "len(bag)")
+        multiset.shuffle_tail(self._elems, n, k, rng)
+        items = self._elems[n - k:]
+        del self._elems[n - k:]
+        return items
+
+    def sample(self, k: int, replace: bool = False, rng=random) -> list:
+        """Return a list of k randomly selected items from this bag, without
+        removing them, in O(k) time. If replace is False, each item in the
+        bag is selected at most once; otherwise, items are selected
+        independently and may be repeated. See grab.
+
+        Sampling without replacement may change the order in which the
+        bag's items are stored (and iterated over).
+
+        Raises ValueError if k is negative, or if replace is False and k is
+        greater than the number of items in the bag.
+
+        >>> bag = ListBag([3, 1, 2, 3, 4])
+        >>> items = bag.sample(3, rng=random.Random(2100))
+        >>> len(items), len(bag)
+        (3, 5)
+        """
+        n = len(self._elems)
+        if replace:
+            if k < 0:
+                raise ValueError("bag.sample(k): k must be >= 0")
+            if n == 0 and k > 0:
+                raise ValueError("bag.sample(k): sample from empty bag")
+            return [self._elems[rng.randrange(n)] for _ in range(k)]
+
+        if not 0 <= k <= n:
+            raise ValueError("bag.sample(k): k must be between 0 and "
+                             "len(bag)")
+        multiset.shuffle_tail(self._elems, n, k, rng)
+        return self._elems[n - k:]
 
     def __add__(self, other: 'ListBag') -> 'ListBag':
         """Return a new ListBag containing the concatenation of self and other.
@@ -220,4 +286,54 @@ class ListBag:
         """
         if not isinstance(other, ListBag):
             return False
-        return sorted(list(self)) == sorted(list(other))
+        if len(self) != len(other):
+            return False
+        return multiset.equal(self._elems, other._elems)
+
+    def __and__(self, other: 'ListBag') -> 'ListBag':
+        """Return a new ListBag containing the intersection of self and other:
+        each item that is in both bags, as many times as it occurs in the
+        bag with fewer occurrences of it.
+
+        Raises TypeError if other is not a ListBag.
+
+        >>> bag1 = ListBag([1, 2, 2, 3])
+        >>> bag2 = ListBag([2, 2, 2, 4, 1])
+        >>> bag1 & bag2
+        ListBag([1, 2, 2])
+        """
+        if not isinstance(other, ListBag):
+            raise TypeError('other must be a ListBag')
+        return ListBag(multiset.intersection(self._elems, other._elems))
+
+    def __or__(self, other: 'ListBag') -> 'ListBag':
+        """Return a new ListBag containing the union of self and other: each
+        item that is in either bag, as many times as it occurs in the bag
+        with more occurrences of it.
+
+        Raises TypeError if other is not a ListBag.
+
+        >>> bag1 = ListBag([1, 2, 2, 3])
+        >>> bag2 = ListBag([2, 2, 2, 4, 1])
+        >>> bag1 | bag2
+        ListBag([1, 2, 2, 2, 3, 4])
+        """
+        if not isinstance(other, ListBag):
+            raise TypeError('other must be a ListBag')
+        return ListBag(multiset.union(self._elems, other._elems))
+
+    def __sub__(self, other: 'ListBag') -> 'ListBag':
+        """Return a new ListBag containing the difference of self and other:
+        the items in self, with one occurrence removed for each occurrence
+        of the same item in other.
+
+        Raises TypeError if other is not a ListBag.
+
+        >>> bag1 = ListBag([1, 2, 2, 3])
+        >>> bag2 = ListBag([2, 4])
+        >>> bag1 - bag2
+        ListBag([1, 2, 3])
+        """
+        if not isinstance(other, ListBag):
+            raise TypeError('other must be a ListBag')
+        return ListBag(multiset.difference(self._elems, other._elems))
@@ -3,14 +3,100 @@
 # An implementation of ADT Bag that uses a fixed-capacity array as the
 # underlying data structure.
 
-import ctypes
+import math
+import operator
 import random
+import sys
+import time
+
+import backing_store
+import binary_format
+import multiset
 
 __author__ = 'Rama Alkhouli'
 
 
+class GrowthPolicy:
+    """Decides when an ArrayBag's backing array is resized, and to what
+    capacity.
+
+    When the backing array is full, its capacity is multiplied by
+    growth_factor. When an item is removed and the capacity is at least
+    shrink_threshold times the number of items, the array is shrunk so
+    that its capacity is growth_factor times the number of items. Setting
+    shrink_threshold to None disables shrinking.
+
+    hysteresis is the number of unused slots below which the array is
+    never shrunk. Without it, a small bag that alternately gains and loses
+    an item can be resized on every operation.
+
+    A subclass can override grow_capacity and shrink_capacity to provide a
+    different policy.
+    """
+
+    def __init__(self, growth_factor: float = 2.0,
+                 shrink_threshold: float = 3.0, hysteresis: int = 0) -> None:
+        """Initialize this GrowthPolicy.
+
+        Raises ValueError if growth_factor is <= 1, if shrink_threshold is
+        not greater than growth_factor, or if hysteresis is negative.
+
+        >>> policy = GrowthPolicy(1.5, 2.5, hysteresis=16)
+        >>> policy.grow_capacity(100, 101)
+        150
+        """
+        if growth_factor <= 1:
+            raise ValueError('GrowthPolicy: growth_factor must be > 1')
+        if shrink_threshold is not None and shrink_threshold <= growth_factor:
+            # Otherwise, a bag that has just grown could shrink again as
+            # soon as one item is removed.
+            raise ValueError('GrowthPolicy: shrink_threshold must be > '
+                             'growth_factor')
+        if hysteresis < 0:
+            raise ValueError('GrowthPolicy: hysteresis must be >= 0')
+        self.growth_factor = growth_factor
+        self.shrink_threshold = shrink_threshold
+        self.hysteresis = hysteresis
+
+    def __repr__(self) -> str:
+        """Return the canonical string representation of this policy."""
+        return '{0}({1!r}, {2!r}, hysteresis={3!r})'.format(
+            self.__class__.__name__, self.growth_factor,
+            self.shrink_threshold, self.hysteresis)
+
+    def grow_capacity(self, num_items: int, required: int) -> int:
+        """Return the new capacity for a full backing array that holds
+        num_items items and must hold at least required items.
+        """
+        return max(1, required, math.ceil(num_items * self.growth_factor))
+
+    def shrink_capacity(self, num_items: int, capacity: int) -> int:
+        """Return the new capacity for a backing array with the specified
+        capacity after an item has been removed, leaving num_items items, or
+        None if the array shouldn't be shrunk.
+        """
+        if self.shrink_threshold is None or \
+                capacity < self.shrink_threshold * num_items or \
+                capacity - num_items <= self.hysteresis:
+            return None
+        new_capacity = max(1, math.ceil(num_items * self.growth_factor))
+        return new_capacity if new_capacity < capacity else None
+
+
+# Number of slots of the backing array copied at a time by _index.
+_SEARCH_BLOCK = 4096
+
+# The policy used by ArrayBags that aren't given one: double the capacity
+# when the array is full, and shrink the array to twice the number of items
+# once its capacity is three times the number of items.
+DEFAULT_POLICY = GrowthPolicy()
+
+
 class ArrayBag:
 
+    # Identifies files written by ArrayBag.save.
+    _FORMAT_TAG = 'ArrayBag'
+
     class _ArrayBagIterator:
         """Supports iteration over ArrayBag objects.
 
@@ -44,12 +130,17 @@ class ArrayBag:
             """Return the iterator object itself."""
             return self
 
-    def __init__(self, iterable=[]) -> None:
+    def __init__(self, iterable=[], policy: GrowthPolicy = None) -> None:
         """Initialize this ArrayBag.
 
         If no iterable is provided, the new ArrayBag is empty.
         Otherwise, initialize the ArrayBag by adding the values
-        provided by the iterable.
+        provided by the iterable. If the iterable's length is known (or it
+        provides a length hint), the backing array is allocated once, with
+        that capacity.
+
+        The backing array is resized as specified by policy (by default,
+        DEFAULT_POLICY).
 
         >>> bag = ArrayBag()
         >>> bag
@@ -58,18 +149,74 @@ class ArrayBag:
         >>> bag
         ArrayBag([1, 4, 3, 6, 3])
         """
+        if policy is None:
+            policy = DEFAULT_POLICY
+        self._policy = policy
         self._num_items = 0  # of elements stored in the ArrayBag
-        self._elems = _new_array(1)  # backing array
+        self._elems = backing_store.new_array(
+            max(1, operator.length_hint(iterable)))
+        # True if an iterator refers to the backing array, so it can't be
+        # recycled when it is replaced.
+        self._shared = False
 
         # Note: len(self._elems) is the capacity of the backing array,
         # and not the number of items in the ArrayBag.
         # The capacity of the backing array is always >= the number of items
         # in the ArrayBag.
 
-        for elem in iterable:
-            self.add(elem)
-            # add() updates self._num_items and increases the capacity of
-            # the backing array, as required.
+        # extend() updates self._num_items and increases the capacity of
+        # the backing array, if the length hint was too small.
+        self.extend(iterable)
+
+    @classmethod
+    def with_capacity(cls, capacity: int,
+                      policy: GrowthPolicy = None) -> 'ArrayBag':
+        """Return a new, empty ArrayBag whose backing array has the
+        specified capacity, so that capacity items can be added without
+        resizing it.
+
+        Raises ValueError if capacity is negative.
+
+        >>> bag = ArrayBag.with_capacity(100)
+        >>> len(bag), bag.capacity()
+        (0, 100)
+        """
+        if capacity < 0:
+            raise ValueError('with_capacity: capacity must be >= 0')
+        bag = cls(policy=policy)
+        if capacity > 1:
+            bag._elems = backing_store.new_array(capacity)
+        return bag
+
+    def capacity(self) -> int:
+        """Return the capacity of this ArrayBag's backing array."""
+        return len(self._elems)
+
+    def reserve(self, capacity: int) -> None:
+        """Ensure that the capacity of this ArrayBag's backing array is at
+        least capacity, so that items can be added until the bag has that
+        many without resizing the array.
+
+        >>> bag = ArrayBag([1, 2, 3])
+        >>> bag.reserve(1000)
+        >>> bag.capacity()
+        1000
+        """
+        if capacity > len(self._elems):
+            self._resize(capacity)
+
+    def shrink_to_fit(self) -> None:
+        """Reduce the capacity of this ArrayBag's backing array to the
+        number of items in the bag (or 1, if the bag is empty).
+
+        >>> bag = ArrayBag.with_capacity(100)
+        >>> bag.add(1)
+        >>> bag.shrink_to_fit()
+        >>> bag.capacity()
+        1
+        """
+        if len(self._elems) > max(1, self._num_items):
+            self._resize(max(1, self._num_items))
 
     def __str__(self) -> str:
         """Return a string representation of this ArrayBag.
@@ -131,6 +278,7 @@ class ArrayBag:
         6
         3
         """
+        self._shared = True
         return ArrayBag._ArrayBagIterator(self)
 
     def __contains__(self, item: any) -> bool:
@@ -145,10 +293,7 @@ class ArrayBag:
         >>> 7 in bag
         False
         """
-        for i in range(len(self)):
-            if self._elems[i] == item:
-                return True
-        return False
+        return self._index(item) >= 0
 
     def add(self, item: any) -> None:
         """Add item to this ArrayBag.
@@ -163,7 +308,8 @@ class ArrayBag:
         if len(self) == len(self._elems):
             # The backing array is full, so replace it with one that
             # has more capacity.
-            self._resize()
+            self._resize(self._policy.grow_capacity(self._num_items,
+                                                    self._num_items + 1))
 
         self._elems[self._num_items] = item
         self._num_items += 1
@@ -208,39 +354,67 @@ class ArrayBag:
 
         if self._num_items == 0:
             raise ValueError("bag.remove(item): remove from empty bag")
-        if item not in self._elems:
-             raise ValueError("bag.remove(item): item is not in bag")
-        
-        # find index of item 
-        i = 0
-        for x in range(len(self)):
-            if self._elems[x] == item:
-                break
-            i += 1
-            
-        # store the item to be removed
-        removed_item = self._elems[i]
-
-        # remove item
-        self._elems[i:self._num_items - 1] = self._elems[i + 1:self._num_items]
-        self._num_items -= 1
-        if len(self._elems) >= 3 * len(self):
-            self._resize()
-        
-        return removed_item
+        i = self._index(item)
+        if i < 0:
+            raise ValueError("bag.remove(item): item is not in bag")
+
+        return self._remove_at(i)
+
+    def discard(self, item: any) -> bool:
+        """Remove one instance of item from this ArrayBag, if it is in the
+        bag. Return True if an item was removed; otherwise False.
+
+        >>> bag = ArrayBag([3, 1, 2, 3, 4])
+        >>> bag.discard(3)
+        True
+        >>> bag.discard(7)
+        False
+        >>> len(bag)
+        4
+        """
+        i = self._index(item)
+        if i < 0:
+            return False
+        self._remove_at(i)
+        return True
+
+    def remove_all(self, item: any) -> int:
+        """Remove every instance of item from this ArrayBag and return the
+        number of items removed. The remaining items keep their order.
+
+        >>> bag = ArrayBag([3, 1, 2, 3, 4])
+        >>> bag.remove_all(3)
+        2
+        >>> bag
+        ArrayBag([1, 2, 4])
+        """
+        n = self._num_items
+        kept = [x for x in self._elems[0:n] if x != item]
+        removed = n - len(kept)
+        if removed > 0:
+            self._elems[0:len(kept)] = kept
+            for i in range(len(kept), n):
+                self._elems[i] = None
+            self._num_items = len(kept)
+            self._shrink()
+        return removed
                
 
 
-    def grab(self) -> any:
+    def grab(self, rng=random) -> any:
         """Remove and return a randomly selected item from this bag.
 
+        The item is selected by rng, which can be a random.Random object
+        (for a reproducible sequence of items) or the random module.
+        Takes O(1) time, unless the backing array is shrunk.
+
         Raises ValueError if the bag is empty.
 
         >>> bag = ArrayBag([3, 1, 2, 3, 4])
         >>> len(bag)
         5
 
-        >>> ArrayBag.grab()
+        >>> bag.grab()
         # grab will randomly select one of items stored in the bag,
         # and remove and return that value. The value displayed in the shell
         # will be one of 1, 2, 3 or 4, depending on which item was removed.
@@ -250,9 +424,63 @@ class ArrayBag:
         """
         if self._num_items == 0:
             raise ValueError("bag.grab(): grab from empty bag")
-        random_item = random.randint(0, len(self)-1)
-        self.remove(random_item)
-        
+        return self._remove_at(rng.randrange(self._num_items))
+
+    def grab_many(self, k: int, rng=random) -> list:
+        """Remove and return a list of k randomly selected items from this
+        bag, in O(k) time (plus the time to shrink the backing array, if
+        required). See grab.
+
+        Raises ValueError if k is negative or greater than the number of
+        items in the bag.
+
+        >>> bag = ArrayBag([3, 1, 2, 3, 4])
+        >>> items = bag.grab_many(2, random.Random(2100))
+        >>> len(items), len(bag)
+        (2, 3)
+        """
+        n = self._num_items
+        if not 0 <= k <= n:
+            raise ValueError("bag.grab_many(k): k must be between 0 and "
+                             "len(bag)")
+        multiset.shuffle_tail(self._elems, n, k, rng)
+        items = self._elems[n - k:n]
+        for i in range(n - k, n):
+            self._elems[i] = None
+        self._num_items = n - k
+        self._shrink()
+        return items
+
+    def sample(self, k: int, replace: bool = False, rng=random) -> list:
+        """Return a list of k randomly selected items from this bag, without
+        removing them, in O(k) time. If replace is False, each item in the
+        bag is selected at most once; otherwise, items are selected
+        independently and may be repeated. See grab.
+
+        Sampling without replacement may change the order in which the
+        bag's items are stored (and iterated over).
+
+        Raises ValueError if k is negative, or if replace is False and k is
+        greater than the number of items in the bag.
+
+        >>> bag = ArrayBag([3, 1, 2, 3, 4])
+        >>> items = bag.sample(3, rng=random.Random(2100))
+        >>> len(items), len(bag)
+        (3, 5)
+        """
+        n = self._num_items
+        if replace:
+            if k < 0:
+                raise ValueError("bag.sample(k): k must be >= 0")
+            if n == 0 and k > 0:
+                raise ValueError("bag.sample(k): sample from empty bag")
+            return [self._elems[rng.randrange(n)] for _ in range(k)]
+
+        if not 0 <= k <= n:
+            raise ValueError("bag.sample(k): k must be between 0 and "
+                             "len(bag)")
+        multiset.shuffle_tail(self._elems, n, k, rng)
+        return self._elems[n - k:n]
 
     def __add__(self, other: 'ArrayBag') -> 'ArrayBag':
         """Return a new ArrayBag containing the concatenation of self and other.
@@ -269,23 +497,79 @@ class ArrayBag:
         order of the elements in the string returned by repr may be different.
         """
         if not isinstance(other, ArrayBag):
-            raise ValueError("can only concatenate ArrayBag to ArrayBag")
-        
-        # newBag = ArrayBag()
-        # n = len(self) + len(other)
-        # newBag._elems = _new_array(n)
-        # newBag._elems[0:len(self)] = self._elems[0:len(self)]
-        # newBag._elems[len(self):n] = other._elems[0:len(other)]
-        # newBag._num_items = n
-        # return newBag
-        # create arraybag with copying elemnts from arraBag self
-        newBag = ArrayBag(self)
-        # loop through other + add items to newBag
-        for item in other:
-            newBag.add(item)
-
+            raise TypeError("can only concatenate ArrayBag to ArrayBag")
+
+        # Allocate the new bag's backing array once, then copy each bag's
+        # items into it with a slice assignment.
+        n = len(self) + len(other)
+        newBag = ArrayBag.with_capacity(n, self._policy)
+        newBag._elems[0:len(self)] = self._elems[0:len(self)]
+        newBag._elems[len(self):n] = other._elems[0:len(other)]
+        newBag._num_items = n
         return newBag
 
+    def __iadd__(self, other: 'ArrayBag') -> 'ArrayBag':
+        """Add all the items in other to this ArrayBag and return this bag.
+
+        Raises TypeError if other is not a ArrayBag.
+
+        >>> bag = ArrayBag([1, 3, 5])
+        >>> bag += ArrayBag([2, 4])
+        >>> bag
+        ArrayBag([1, 3, 5, 2, 4])
+        """
+        if not isinstance(other, ArrayBag):
+            raise TypeError("can only concatenate ArrayBag to ArrayBag")
+        self.extend(other)
+        return self
+
+    def extend(self, iterable) -> None:
+        """Add all the values provided by iterable to this ArrayBag. The
+        backing array is resized at most once.
+
+        >>> bag = ArrayBag([1, 3, 5])
+        >>> bag.extend(range(3))
+        >>> bag
+        ArrayBag([1, 3, 5, 0, 1, 2])
+        """
+        if isinstance(iterable, ArrayBag):
+            items = iterable._items()
+        elif isinstance(iterable, list):
+            items = iterable
+        else:
+            items = list(iterable)
+
+        n = self._num_items + len(items)
+        if n > len(self._elems):
+            self._resize(self._policy.grow_capacity(self._num_items, n))
+        self._elems[self._num_items:n] = items
+        self._num_items = n
+
+    @classmethod
+    def merge_all(cls, bags, policy: GrowthPolicy = None) -> 'ArrayBag':
+        """Return a new ArrayBag containing the items of all the ArrayBags
+        provided by the iterable bags. The new bag's backing array is
+        allocated once, with the total number of items as its capacity.
+
+        Raises TypeError if any of the bags is not an ArrayBag.
+
+        >>> ArrayBag.merge_all([ArrayBag([1, 2]), ArrayBag(), ArrayBag([3])])
+        ArrayBag([1, 2, 3])
+        """
+        bags = list(bags)
+        for bag in bags:
+            if not isinstance(bag, ArrayBag):
+                raise TypeError("merge_all: bags must be ArrayBags")
+
+        n = sum([len(bag) for bag in bags])
+        merged = cls.with_capacity(n, policy)
+        start = 0
+        for bag in bags:
+            merged._elems[start:start + len(bag)] = bag._elems[0:len(bag)]
+            start += len(bag)
+        merged._num_items = n
+        return merged
+
     def __eq__(self, other: 'ArrayBag') -> bool:
         """Return True if self is equal to the ArrayBag referred to by other;
         otherwise return False.
@@ -304,68 +588,314 @@ class ArrayBag:
             return False
         if len(other) != len(self):
             return False
-        for i in range(len(self)):
-            for j in range(len(other)):
-                if self._elems[i] != other._elems[j]:
-                    j += 1     
-            return False
-            i +=1
-            
-        return True
+        return multiset.equal(self._items(), other._items())
 
-        # lst1 = list(self)
-        # lst2 = list(other)
-        
-        # if sorted(lst1) == sorted(lst2):
-        #     return True
-        # else:
-        #     return False
-        
-        
+    def __and__(self, other: 'ArrayBag') -> 'ArrayBag':
+        """Return a new ArrayBag containing the intersection of self and other:
+        each item that is in both bags, as many times as it occurs in the
+        bag with fewer occurrences of it.
 
-    def _resize(self) -> None:
-        """Change this ArrayBag's capacity to 2 * n, where n is the number of
-        elements in the bag. If the bag is empty, change its capacity to 1.
+        Raises TypeError if other is not an ArrayBag.
+
+        >>> bag1 = ArrayBag([1, 2, 2, 3])
+        >>> bag2 = ArrayBag([2, 2, 2, 4, 1])
+        >>> bag1 & bag2
+        ArrayBag([1, 2, 2])
         """
-        # Allocate a new array with the required capacity.
-        arr = _new_array(max(1, 2 * self._num_items))
+        if not isinstance(other, ArrayBag):
+            raise TypeError('other must be an ArrayBag')
+        return ArrayBag(multiset.intersection(self._items(), other._items()))
 
-        # Copy the _num_items elements in the current backing array to the
-        # new array.
-        arr[0:self._num_items] = self._elems[0:self._num_items]
+    def __or__(self, other: 'ArrayBag') -> 'ArrayBag':
+        """Return a new ArrayBag containing the union of self and other: each
+        item that is in either bag, as many times as it occurs in the bag
+        with more occurrences of it.
 
-        # Replace the current backing array.
-        self._elems = arr
+        Raises TypeError if other is not an ArrayBag.
 
+        >>> bag1 = ArrayBag([1, 2, 2, 3])
+        >>> bag2 = ArrayBag([2, 2, 2, 4, 1])
+        >>> bag1 | bag2
+        ArrayBag([1, 2, 2, 2, 3, 4])
+        """
+        if not isinstance(other, ArrayBag):
+            raise TypeError('other must be an ArrayBag')
+        return ArrayBag(multiset.union(self._items(), other._items()))
 
-def _new_array(capacity: int) -> 'py_object_Array_<capacity>':
-    """Return a new array with the specified capacity that stores
-    references to Python objects. All elements are initialized to None.
+    def __sub__(self, other: 'ArrayBag') -> 'ArrayBag':
+        """Return a new ArrayBag containing the difference of self and other:
+        the items in self, with one occurrence removed for each occurrence
+        of the same item in other.
 
-    >>> arr = _new_array(10)
-    >>> len(arr)
-    10
+        Raises TypeError if other is not an ArrayBag.
 
-    >>> for i in range(10):
-    ...      a[i] = 2 * i
-    ...
+        >>> bag1 = ArrayBag([1, 2, 2, 3])
+        >>> bag2 = ArrayBag([2, 4])
+        >>> bag1 - bag2
+        ArrayBag([1, 2, 3])
+        """
+        if not isinstance(other, ArrayBag):
+            raise TypeError('other must be an ArrayBag')
+        return ArrayBag(multiset.difference(self._items(), other._items()))
 
-    >>> arr[0]
-    0
-    >>> arr[9]
-    18
+    def save(self, filename: str) -> None:
+        """Save the items in this ArrayBag to a binary file with the specified
+        filename, which can be loaded with ArrayBag.load.
+        """
+        binary_format.save_items(filename, self._items(), self._FORMAT_TAG)
 
-    >>> 4 in arr
-    True
-    >>> 3 in arr
-    False
-    """
-    if capacity <= 0:
-        raise ValueError('new_array: capacity must be > 0')
+    def to_bytes(self) -> bytes:
+        """Return the items in this ArrayBag encoded in the same binary format
+        as a file written by save, which can be decoded with
+        ArrayBag.from_buffer.
+        """
+        return binary_format.dumps(self._items(), self._FORMAT_TAG)
+
+    @classmethod
+    def load(cls, filename: str) -> 'ArrayBag':
+        """Return a new ArrayBag containing the items in a binary file
+        written by save. The file is memory-mapped, and its items are
+        copied into the new bag's backing array in bulk, not added one by one.
+
+        Raises ValueError if the file wasn't written by ArrayBag.save.
+
+        >>> bag = ArrayBag([3, 1, 2, 3, 4])
+        >>> import os, tempfile
+        >>> tmpdir = tempfile.TemporaryDirectory()
+        >>> filename = os.path.join(tmpdir.name, 'bag.bin')
+        >>> bag.save(filename)
+        >>> ArrayBag.load(filename)
+        ArrayBag([3, 1, 2, 3, 4])
+        >>> tmpdir.cleanup()
+        """
+        items = binary_format.load_items(filename, cls._FORMAT_TAG)
+        return cls._from_list(items)
+
+    @classmethod
+    def from_buffer(cls, buffer) -> 'ArrayBag':
+        """Return a new ArrayBag containing the items encoded in buffer (bytes
+        returned by to_bytes, or any object that supports the buffer
+        protocol and holds the contents of a file written by save).
+
+        Raises ValueError if the buffer doesn't hold a saved ArrayBag.
+        """
+        items = binary_format.read_items(buffer, cls._FORMAT_TAG)
+        return cls._from_list(items)
+
+    @classmethod
+    def _from_list(cls, items: list) -> 'ArrayBag':
+        """Return a new ArrayBag whose backing array holds the items in the
+        list items, in the same order.
+        """
+        bag = cls.with_capacity(len(items))
+        bag._elems[0:len(items)] = items
+        bag._num_items = len(items)
+        return bag
+
+    def _remove_at(self, i: int) -> any:
+        """Remove and return the item at index i of the backing array.
+
+        The order of the items in a bag doesn't matter, so instead of
+        shifting the items after the removed one, the last item is moved
+        into the hole.
+        """
+        item = self._elems[i]
+        last = self._num_items - 1
+        self._elems[i] = self._elems[last]
+        self._elems[last] = None
+        self._num_items = last
+        self._shrink()
+        return item
+
+    def _index(self, item: any) -> int:
+        """Return the index of the first occurrence of item in the backing
+        array, or -1 if item isn't in this ArrayBag.
+
+        Only the occupied slots are searched. They are copied to a list
+        (and searched with list.index, in C) a block at a time, so a match
+        near the front of the array is found without copying the rest.
+        """
+        for start in range(0, self._num_items, _SEARCH_BLOCK):
+            stop = min(start + _SEARCH_BLOCK, self._num_items)
+            try:
+                return self._elems[start:stop].index(item) + start
+            except ValueError:
+                pass
+        return -1
+
+    def _items(self) -> list:
+        """Return a list of the items in this ArrayBag."""
+        return self._elems[0:self._num_items]
+
+    def _shrink(self) -> None:
+        """Shrink the backing array, if this ArrayBag's policy says that it
+        has too much unused capacity.
+        """
+        capacity = self._policy.shrink_capacity(self._num_items,
+                                                len(self._elems))
+        if capacity is not None:
+            self._resize(capacity)
+
+    def _resize(self, capacity: int) -> None:
+        """Change this ArrayBag's capacity to the specified capacity, which
+        must be at least the number of elements in the bag.
+        """
+        # Allocate a new array with the required capacity.
+        arr = backing_store.new_array(capacity)
+
+        # Copy the _num_items elements in the current backing array to the
+        # new array.
+        arr[0:self._num_items] = self._elems[0:self._num_items]
+
+        # Replace the current backing array. The old array can be recycled
+        # unless an iterator still refers to it.
+        old = self._elems
+        self._elems = arr
+        if not self._shared:
+            backing_store.release(old)
+        self._shared = False
 
-    PyCArrayType = ctypes.py_object * capacity
-    a = PyCArrayType()
-    for i in range(len(a)):
-        a[i] = None
 
-    return a
+def _count_resizes(function) -> tuple[int, int, float]:
+    """Call function() and return the number of times ArrayBag._resize was
+    called, the total number of items it copied, and the elapsed time in
+    seconds.
+    """
+    calls = 0
+    copied = 0
+    resize = ArrayBag._resize
+
+    def counting_resize(bag, capacity):
+        nonlocal calls, copied
+        calls += 1
+        copied += bag._num_items
+        resize(bag, capacity)
+
+    ArrayBag._resize = counting_resize
+    try:
+        start = time.perf_counter()
+        function()
+        elapsed = time.perf_counter() - start
+    finally:
+        ArrayBag._resize = resize
+    return calls, copied, elapsed
+
+
+def _shifting_remove(bag: ArrayBag, item: any) -> any:
+    """Remove one instance of item from bag the way ArrayBag.remove used
+    to: by searching the whole backing array, finding the item's index
+    with a second scan and shifting the following items left. Used by the
+    benchmark below.
+    """
+    if item not in bag._elems:
+        raise ValueError("bag.remove(item): item is not in bag")
+    i = 0
+    while bag._elems[i] != item:
+        i += 1
+    bag._elems[i:bag._num_items - 1] = bag._elems[i + 1:bag._num_items]
+    bag._num_items -= 1
+    bag._elems[bag._num_items] = None
+    bag._shrink()
+    return item
+
+
+def _mixed_workload(bag: ArrayBag, remove, ops: list[tuple[bool, int]]
+                    ) -> float:
+    """Apply ops to bag and return the elapsed time in seconds. Each op is
+    an (add, item) tuple: item is added if add is True, otherwise it is
+    removed by calling remove(bag, item).
+    """
+    start = time.perf_counter()
+    for add, item in ops:
+        if add:
+            bag.add(item)
+        else:
+            remove(bag, item)
+    return time.perf_counter() - start
+
+
+if __name__ == '__main__':
+    # Usage: python lab3_arraybag.py [number of items]
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 10 ** 6
+    items = list(range(n))
+
+    def add_all(bag):
+        for item in items:
+            bag.add(item)
+
+    def thrash(bag):
+        # A small bag that repeatedly grows from 1 to 3 items and back,
+        # crossing both the growth and the shrink boundary.
+        bag.add(-1)
+        for item in items:
+            bag.add(item)
+            bag.add(item)
+            bag.remove(item)
+            bag.remove(item)
+
+    def drain(bag):
+        for _ in items:
+            bag.grab()
+
+    def concatenate(bags):
+        # What __add__ used to do: add the items one at a time.
+        result = ArrayBag()
+        for bag in bags:
+            for item in bag:
+                result.add(item)
+        return result
+
+    half = ArrayBag(items[:n // 2])
+    tenths = [ArrayBag(items[i::10]) for i in range(10)]
+
+    cases = [
+        ('add, factor 2', lambda: add_all(ArrayBag())),
+        ('add, factor 1.5',
+         lambda: add_all(ArrayBag(policy=GrowthPolicy(1.5, 2.5)))),
+        ('add, with_capacity', lambda: add_all(ArrayBag.with_capacity(n))),
+        ('ArrayBag(generator)', lambda: ArrayBag(x for x in items)),
+        ('ArrayBag(list)', lambda: ArrayBag(items)),
+        ('add/remove, hysteresis 0', lambda: thrash(ArrayBag())),
+        ('add/remove, hysteresis 16',
+         lambda: thrash(ArrayBag(policy=GrowthPolicy(hysteresis=16)))),
+        ('grab all', lambda: drain(ArrayBag(items))),
+        ('grab all, no shrinking',
+         lambda: drain(ArrayBag(items, GrowthPolicy(shrink_threshold=None)))),
+        ('add items of 2 bags', lambda: concatenate([half, half])),
+        ('bag + bag', lambda: half + half),
+        ('bag += bag', lambda: ArrayBag(items[:n // 2]).__iadd__(half)),
+        ('add items of 10 bags', lambda: concatenate(tenths)),
+        ('merge_all, 10 bags', lambda: ArrayBag.merge_all(tenths)),
+    ]
+    print('{0:<28}{1:>10}{2:>14}{3:>10}'.format('n = {0}'.format(n),
+                                                '_resize', 'items copied',
+                                                'seconds'))
+    for name, function in cases:
+        calls, copied, elapsed = _count_resizes(function)
+        print('{0:<28}{1:>10}{2:>14}{3:>10.3f}'.format(name, calls, copied,
+                                                       elapsed))
+
+    # Mixed workload: a bag of n items, then a random sequence of adds and
+    # removes of items that are in the bag.
+    rng = random.Random(2100)
+    ops = []
+    present = list(items)
+    # The old remove takes a large fraction of a second per call at
+    # 10 ** 6 items, so only a few hundred operations are timed.
+    for i in range(200):
+        if rng.random() < 0.5:
+            ops.append((True, n + i))
+            present.append(n + i)
+        else:
+            j = rng.randrange(len(present))
+            present[j], present[-1] = present[-1], present[j]
+            ops.append((False, present.pop()))
+
+    print()
+    print('{0} mixed adds/removes on a bag of {1} items'.format(len(ops), n))
+    for name, remove in [('remove (swap with last)', ArrayBag.remove),
+                         ('remove (shift)', _shifting_remove)]:
+        bag = ArrayBag(items)
+        elapsed = _mixed_workload(bag, remove, ops)
+        assert sorted(bag) == sorted(present)
+        print('{0:<28}{1:>10.3f} s'.format(name, elapsed))
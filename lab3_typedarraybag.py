@@ -0,0 +1,324 @@
+# SYSC 2100 Winter 2023 Lab 3
+
+# An implementation of ADT Bag for numbers of a single C type, that uses an
+# instance of Python's array.array type as the underlying data structure.
+#
+# Unlike ArrayBag, which stores a reference to a boxed Python object in each
+# slot of its backing array, a TypedArrayBag stores the numbers themselves
+# in one contiguous buffer (e.g., 8 bytes per item for type code 'd'
+# instead of 8 bytes for the reference plus 24 for each float object).
+# count, __contains__, add_many and merge run in C instead of in an
+# interpreted loop, using NumPy if it is installed. The buffer can be
+# shared with NumPy, without copying it, through buffer() or to_numpy().
+
+import array
+import numbers
+import random
+import sys
+import time
+
+from lab3_arraybag import ArrayBag
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+__author__ = 'Rama Alkhouli'
+
+
+class TypedArrayBag:
+
+    def __init__(self, typecode: str, iterable=[]) -> None:
+        """Initialize this TypedArrayBag to store numbers of the type
+        specified by typecode, one of the type codes of the array module:
+        'b', 'B', 'h', 'H', 'i', 'I', 'l', 'L', 'q', 'Q', 'f' or 'd'.
+
+        If no iterable is provided, the new TypedArrayBag is empty.
+        Otherwise, initialize the TypedArrayBag by adding the values
+        provided by the iterable.
+
+        Raises ValueError if typecode isn't a numeric type code.
+        Raises TypeError or OverflowError if a value can't be stored as the
+        specified type.
+
+        >>> bag = TypedArrayBag('d')
+        >>> bag
+        TypedArrayBag('d', [])
+        >>> bag = TypedArrayBag('i', [1, 4, 3, 6, 3])
+        >>> bag
+        TypedArrayBag('i', [1, 4, 3, 6, 3])
+        """
+        if typecode not in _NUMERIC_TYPECODES:
+            raise ValueError('TypedArrayBag: typecode must be one of ' +
+                             repr(_NUMERIC_TYPECODES))
+        self.typecode = typecode
+        self._elems = array.array(typecode)  # backing array
+        self.add_many(iterable)
+
+    def __str__(self) -> str:
+        """Return a string representation of this TypedArrayBag.
+
+        >>> bag = TypedArrayBag('i', [1, 4, 3, 6, 3])
+        >>> str(bag)
+        '{1, 4, 3, 6, 3}'
+        """
+        return "{{{0}}}".format(", ".join([repr(x) for x in self._elems]))
+
+    def __repr__(self) -> str:
+        """Return the canonical string representation of this TypedArrayBag.
+
+        >>> bag = TypedArrayBag('d', [3, 1.5])
+        >>> repr(bag)
+        "TypedArrayBag('d', [3.0, 1.5])"
+        """
+        return "{0}({1!r}, {2})".format(self.__class__.__name__,
+                                        self.typecode, self._elems.tolist())
+
+    def __len__(self) -> int:
+        """Return the number of items in this TypedArrayBag."""
+        return len(self._elems)
+
+    def __iter__(self):
+        """Return an iterator for this TypedArrayBag."""
+        return iter(self._elems)
+
+    def __contains__(self, item: any) -> bool:
+        """Return True if item is in this TypedArrayBag; otherwise False.
+
+        >>> bag = TypedArrayBag('i', [1, 4, 3, 6])
+        >>> 4 in bag
+        True
+        >>> 4.5 in bag
+        False
+        """
+        if not isinstance(item, numbers.Real):
+            return False
+        if np is not None:
+            return bool((self.to_numpy() == item).any())
+        return item in self._elems
+
+    def add(self, item: any) -> None:
+        """Add item to this TypedArrayBag.
+
+        Raises TypeError or OverflowError if item can't be stored as this
+        bag's type.
+        """
+        self._elems.append(item)
+
+    def add_many(self, iterable) -> None:
+        """Add all the values provided by iterable to this TypedArrayBag.
+
+        If iterable is a TypedArrayBag, an array.array or another object
+        that supports the buffer protocol (e.g., a NumPy array) with the same
+        item type, its buffer is copied in one operation. Buffers of other
+        types are converted in C, without an interpreted loop.
+
+        Raises TypeError or OverflowError if a value can't be stored as this
+        bag's type.
+
+        >>> bag = TypedArrayBag('q', [1, 2])
+        >>> bag.add_many(range(3, 6))
+        >>> bag
+        TypedArrayBag('q', [1, 2, 3, 4, 5])
+        """
+        if isinstance(iterable, TypedArrayBag):
+            iterable = iterable._elems
+        view = None
+        if not isinstance(iterable, (list, tuple, range)):
+            view = _typed_view(iterable)
+        if view is None:
+            self._elems.extend(iterable)
+        elif view.format == self.typecode and \
+                view.itemsize == self._elems.itemsize:
+            data = view.cast('B')
+            if iterable is self._elems:
+                # An array can't be resized while it is exporting a buffer,
+                # so the items are copied before the view is released.
+                data = bytes(data)
+                view.release()
+            self._elems.frombytes(data)
+        else:
+            # A buffer of a different type: its items have to be converted
+            # one by one.
+            self._elems.fromlist(view.tolist())
+
+    def merge(self, other: 'TypedArrayBag') -> None:
+        """Add all the items in other to this TypedArrayBag.
+
+        Raises TypeError if other is not a TypedArrayBag.
+        Raises TypeError or OverflowError if an item in other can't be
+        stored as this bag's type.
+        """
+        if not isinstance(other, TypedArrayBag):
+            raise TypeError('other must be a TypedArrayBag')
+        self.add_many(other)
+
+    def count(self, item: any) -> int:
+        """Return the total number of occurrences of item in this bag.
+
+        >>> bag = TypedArrayBag('d', [3, 1, 2, 3, 4])
+        >>> bag.count(3)
+        2
+        >>> bag.count(7)
+        0
+        """
+        if not isinstance(item, numbers.Real):
+            return 0
+        if np is not None:
+            return int(np.count_nonzero(self.to_numpy() == item))
+        return self._elems.count(item)
+
+    def remove(self, item: any) -> any:
+        """Remove and return one instance of item from this TypedArrayBag.
+        The last item is moved into its place, so the order of the remaining
+        items may change.
+
+        Raises ValueError if the bag is empty.
+        Raises ValueError if item is not in the bag.
+
+        >>> bag = TypedArrayBag('i', [3, 1, 2, 3, 4])
+        >>> bag.remove(3)
+        3
+        >>> bag
+        TypedArrayBag('i', [4, 1, 2, 3])
+        """
+        if len(self._elems) == 0:
+            raise ValueError("bag.remove(item): remove from empty bag")
+        try:
+            i = self._elems.index(item)
+        except (ValueError, TypeError):
+            raise ValueError("bag.remove(item): item is not in bag")
+        removed_item = self._elems[i]
+        self._elems[i] = self._elems[-1]
+        self._elems.pop()
+        return removed_item
+
+    def grab(self, rng=random) -> any:
+        """Remove and return a randomly selected item from this bag, in O(1)
+        time. The item is selected by rng, which can be a random.Random
+        object or the random module.
+
+        Raises ValueError if the bag is empty.
+        """
+        if len(self._elems) == 0:
+            raise ValueError("bag.grab(): grab from empty bag")
+        i = rng.randrange(len(self._elems))
+        item = self._elems[i]
+        self._elems[i] = self._elems[-1]
+        self._elems.pop()
+        return item
+
+    def buffer(self) -> memoryview:
+        """Return a memoryview of this TypedArrayBag's items, which shares
+        its buffer (no items are copied).
+
+        While the memoryview (or any object created from it, such as a NumPy
+        array) exists, items can't be added to or removed from the bag;
+        attempting to do so raises BufferError.
+
+        >>> bag = TypedArrayBag('d', [1.5, 2.5])
+        >>> view = bag.buffer()
+        >>> view.format, view.nbytes, view[1]
+        ('d', 16, 2.5)
+        """
+        return memoryview(self._elems)
+
+    def __buffer__(self, flags: int) -> memoryview:
+        """Support the buffer protocol (Python 3.12 and later), so that a
+        TypedArrayBag can be passed directly to memoryview() or
+        numpy.asarray() without copying its items.
+        """
+        return memoryview(self._elems)
+
+    def to_numpy(self) -> 'numpy.ndarray':
+        """Return a NumPy array that shares this TypedArrayBag's buffer. See
+        buffer().
+
+        Raises ImportError if NumPy isn't installed.
+        """
+        if np is None:
+            raise ImportError('to_numpy: NumPy is not installed')
+        return np.frombuffer(self._elems, dtype=self._elems.typecode)
+
+    def __add__(self, other: 'TypedArrayBag') -> 'TypedArrayBag':
+        """Return a new TypedArrayBag containing the concatenation of self
+        and other, with self's type code.
+
+        Raises TypeError if other is not a TypedArrayBag.
+
+        >>> TypedArrayBag('i', [1, 3]) + TypedArrayBag('i', [2])
+        TypedArrayBag('i', [1, 3, 2])
+        """
+        if not isinstance(other, TypedArrayBag):
+            raise TypeError('other must be a TypedArrayBag')
+        bag = TypedArrayBag(self.typecode, self)
+        bag.add_many(other)
+        return bag
+
+    def __eq__(self, other: 'TypedArrayBag') -> bool:
+        """Return True if self and other contain the same numbers, the same
+        number of times, in any order; otherwise False. The type codes may
+        differ (e.g., 1 in an 'i' bag is equal to 1.0 in a 'd' bag).
+
+        >>> TypedArrayBag('i', [1, 2, 3]) == TypedArrayBag('d', [3, 2, 1])
+        True
+        """
+        if not isinstance(other, TypedArrayBag):
+            return False
+        if len(self) != len(other):
+            return False
+        if np is not None:
+            return bool((np.sort(self.to_numpy()) ==
+                         np.sort(other.to_numpy())).all())
+        return sorted(self._elems) == sorted(other._elems)
+
+
+# The array module's type codes, except 'u' (Unicode characters).
+_NUMERIC_TYPECODES = 'bBhHiIlLqQfd'
+
+
+def _typed_view(obj) -> memoryview:
+    """Return a one-dimensional, contiguous memoryview of obj, or None if
+    obj doesn't support the buffer protocol (or isn't one-dimensional and
+    contiguous).
+    """
+    try:
+        view = memoryview(obj)
+    except TypeError:
+        return None
+    if view.ndim != 1 or not view.c_contiguous:
+        return None
+    return view
+
+
+if __name__ == '__main__':
+    # Usage: python lab3_typedarraybag.py [number of items]
+    # Compare the memory use and query times of ArrayBag and TypedArrayBag
+    # for a bag of n floats.
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 10 ** 6
+    rng = random.Random(2100)
+    values = [float(rng.randrange(1000)) for _ in range(n)]
+
+    array_bag = ArrayBag(values)
+    typed_bag = TypedArrayBag('d', values)
+    # ArrayBag holds a reference to a float object per item.
+    array_bytes = sys.getsizeof(array_bag._elems) + \
+        sum(map(sys.getsizeof, values))
+    typed_bytes = sys.getsizeof(typed_bag._elems)
+    print('NumPy: {0}'.format('yes' if np is not None else 'no'))
+    print('{0:<16}{1:>12}{2:>14}{3:>14}{4:>14}'.format(
+        'n = {0}'.format(n), 'MB', 'count (ms)', 'in (ms)', 'merge (ms)'))
+    for name, bag, size in [('ArrayBag', array_bag, array_bytes),
+                            ('TypedArrayBag', typed_bag, typed_bytes)]:
+        start = time.perf_counter()
+        bag.count(500.0)
+        count_ms = (time.perf_counter() - start) * 1000
+        start = time.perf_counter()
+        -1.0 in bag
+        contains_ms = (time.perf_counter() - start) * 1000
+        start = time.perf_counter()
+        bag + bag
+        merge_ms = (time.perf_counter() - start) * 1000
+        print('{0:<16}{1:>12.1f}{2:>14.2f}{3:>14.2f}{4:>14.2f}'.format(
+            name, size / (1 << 20), count_ms, contains_ms, merge_ms))
@@ -2,13 +2,17 @@
 # Class ArrayList is an implementation of ADT List that uses an array as the
 # underlying data structure. The iterator is implemented by a generator.
 
-import ctypes  # To create the backing array.
+import backing_store  # To create the backing array.
+import binary_format
 
 __author__ = 'Rama Alkhouli'
 
 
 class ArrayList:
 
+    # Identifies files written by ArrayList.save.
+    _FORMAT_TAG = 'ArrayLst'
+
     def __init__(self, iterable=[]) -> None:
         """Initialize this ArrayList.
 
@@ -24,7 +28,7 @@ class ArrayList:
         ArrayList([1, 4, 3, 6])
         """
         self._num_items = 0  # of elements stored in the ArrayList
-        self._elems = _new_array(1)  # backing array
+        self._elems = backing_store.new_array(1)  # backing array
 
         # Note: len(self._elems) is the capacity of the backing array,
         # and not the number of items in the ArrayList.
@@ -248,7 +252,7 @@ class ArrayList:
 
         newlist = ArrayList()
         n = len(self) + len(other)
-        newlist._elems = _new_array(n)
+        newlist._elems = backing_store.new_array(n)
         newlist._elems[0:len(self)] = self._elems[0:len(self)]
         newlist._elems[len(self):n] = other._elems[0:len(other)]
         newlist._num_items = n
@@ -448,51 +452,76 @@ class ArrayList:
             return ArrayList()
         return iter(self._elems[self._num_items - 1::-1])
 
+    def save(self, filename: str) -> None:
+        """Save the items in this ArrayList to a binary file with the
+        specified filename, which can be loaded with ArrayList.load.
+        """
+        binary_format.save_items(filename, self._elems[0:self._num_items],
+                                 self._FORMAT_TAG)
+
+    def to_bytes(self) -> bytes:
+        """Return the items in this ArrayList encoded in the same binary
+        format as a file written by save, which can be decoded with
+        ArrayList.from_buffer.
+        """
+        return binary_format.dumps(self._elems[0:self._num_items],
+                                   self._FORMAT_TAG)
+
+    @classmethod
+    def load(cls, filename: str) -> 'ArrayList':
+        """Return a new ArrayList containing the items in a binary file
+        written by save. The file is memory-mapped, and its items are
+        copied into the new list's backing array in bulk, not added one by one.
+
+        Raises ValueError if the file wasn't written by ArrayList.save.
 
+        >>> lst = ArrayList([1, 4, 3, 6])
+        >>> import os, tempfile
+        >>> tmpdir = tempfile.TemporaryDirectory()
+        >>> filename = os.path.join(tmpdir.name, 'list.bin')
+        >>> lst.save(filename)
+        >>> ArrayList.load(filename)
+        ArrayList([1, 4, 3, 6])
+        >>> tmpdir.cleanup()
+        """
+        items = binary_format.load_items(filename, cls._FORMAT_TAG)
+        return cls._from_list(items)
+
+    @classmethod
+    def from_buffer(cls, buffer) -> 'ArrayList':
+        """Return a new ArrayList containing the items encoded in buffer
+        (bytes returned by to_bytes, or any object that supports the buffer
+        protocol and holds the contents of a file written by save).
+
+        Raises ValueError if the buffer doesn't hold a saved ArrayList.
+        """
+        items = binary_format.read_items(buffer, cls._FORMAT_TAG)
+        return cls._from_list(items)
+
+    @classmethod
+    def _from_list(cls, items: list) -> 'ArrayList':
+        """Return a new ArrayList containing the elements of the list
+        items, in the same order.
+        """
+        newlist = cls()
+        newlist._elems = backing_store.new_array(max(1, len(items)))
+        newlist._elems[0:len(items)] = items
+        newlist._num_items = len(items)
+        return newlist
 
     def _resize(self) -> None:
         """Change this ArrayList's capacity to 2 * n, where n is the number of
         elements in the list. If the list is empty, change its capacity to 1.
         """
         # Allocate a new array with the required capacity.
-        arr = _new_array(max(1, 2 * self._num_items))
+        arr = backing_store.new_array(max(1, 2 * self._num_items))
 
         # Copy the _num_items elements in the current backing array to the
         # new array.
         arr[0:self._num_items] = self._elems[0:self._num_items]
 
-        # Replace the current backing array.
+        # Replace the current backing array and recycle the old one (the
+        # generator returned by __iter__ doesn't refer to it).
+        old = self._elems
         self._elems = arr
-
-
-def _new_array(capacity: int) -> 'py_object_Array_<capacity>':
-    """Return a new array with the specified capacity that stores
-    references to Python objects. All elements are initialized to None.
-
-    >>> arr = _new_array(10)
-    >>> len(arr)
-    10
-
-    >>> for i in range(10):
-    ...      a[i] = 2 * i
-    ...
-
-    >>> arr[0]
-    0
-    >>> arr[9]
-    18
-
-    >>> 4 in arr
-    True
-    >>> 3 in arr
-    False
-    """
-    if capacity <= 0:
-        raise ValueError('new_array: capacity must be > 0')
-
-    PyCArrayType = ctypes.py_object * capacity
-    a = PyCArrayType()
-    for i in range(len(a)):
-        a[i] = None
-
-    return a
+        backing_store.release(old)
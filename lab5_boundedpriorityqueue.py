@@ -1,6 +1,7 @@
 
 from collections import deque
-import ctypes
+
+import backing_store
 
 __author__ = 'Rama Alkhoui'
 
@@ -30,7 +31,7 @@ class BoundedPriorityQueue:
         # Each deque will be used as a FIFO queue. All elements with
         # priority k will be stored in self._queues[k] in FIFO order.
 
-        self._queues = _new_array(num_levels)
+        self._queues = backing_store.new_array(num_levels)
         for i in range(num_levels):
             self._queues[i] = deque()
 
@@ -123,35 +124,3 @@ class BoundedPriorityQueue:
                     self._num_items -= 1
                     return self._queues[i].popleft()
                 
-
-def _new_array(capacity: int) -> 'py_object_Array_<capacity>':
-    """Return a new array with the specified capacity that stores
-    references to Python objects. All elements are initialized to None.
-
-    >>> arr = _new_array(10)
-    >>> len(arr)
-    10
-
-    >>> for i in range(10):
-    ...      a[i] = 2 * i
-    ...
-
-    >>> arr[0]
-    0
-    >>> arr[9]
-    18
-
-    >>> 4 in arr
-    True
-    >>> 3 in arr
-    False
-    """
-    if capacity <= 0:
-        raise ValueError('new_array: capacity must be > 0')
-
-    PyCArrayType = ctypes.py_object * capacity
-    a = PyCArrayType()
-    for i in range(len(a)):
-        a[i] = None
-
-    return a
@@ -0,0 +1,158 @@
+# SYSC 2100 Winter 2023
+
+# Multiset (bag) operations shared by the implementations of ADT Bag.
+# Each function takes the items of two bags (as lists, or any other
+# iterables that can be iterated over more than once) and compares or
+# combines them by counting the occurrences of each distinct item.
+#
+# Hashable items are counted with a dict (a Counter), so the functions run
+# in O(n) expected time. If any item is unhashable, the items are counted by
+# comparing them with ==, which takes O(n * d) time for d distinct items.
+#
+# shuffle_tail is the random selection step shared by the bags' grab_many
+# and sample methods.
+
+from collections import Counter
+
+__author__ = 'Rama Alkhouli'
+
+
+def equal(items1, items2) -> bool:
+    """Return True if items1 and items2 contain the same items with the same
+    multiplicities, in any order; otherwise False.
+
+    >>> equal([1, 2, 3, 2], [2, 3, 2, 1])
+    True
+    >>> equal([1, 2, 2], [1, 1, 2])
+    False
+    >>> equal([[1], [2]], [[2], [1]])   # unhashable items
+    True
+    >>> equal([{1}, {2}], [{2}, {1}])   # partially ordered items
+    True
+    """
+    try:
+        return Counter(items1) == Counter(items2)
+    except TypeError:
+        pass
+
+    # Sorting takes O(n log n) time, but only needs the items to be
+    # orderable. If the sorted lists are equal, the bags are equal. If not,
+    # they may still be equal if < is only a partial order (e.g., for sets,
+    # < means "is a proper subset of"), so the items are then counted.
+    try:
+        if sorted(items1) == sorted(items2):
+            return True
+    except TypeError:
+        pass
+
+    pairs1 = _pairs(items1)
+    pairs2 = _pairs(items2)
+    if len(pairs1) != len(pairs2):
+        return False
+    for item, n in pairs1:
+        if _lookup(pairs2, item) != n:
+            return False
+    return True
+
+
+def intersection(items1, items2) -> list:
+    """Return a list of the items common to items1 and items2. Each item
+    occurs min(m, n) times, where m and n are its multiplicities in items1
+    and items2.
+
+    >>> intersection([1, 2, 2, 3], [2, 2, 2, 4, 1])
+    [1, 2, 2]
+    """
+    return _combine(items1, items2, Counter.__and__, min)
+
+
+def union(items1, items2) -> list:
+    """Return a list of the items in items1 or items2. Each item occurs
+    max(m, n) times, where m and n are its multiplicities in items1 and
+    items2.
+
+    >>> union([1, 2, 2, 3], [2, 2, 2, 4, 1])
+    [1, 2, 2, 2, 3, 4]
+    """
+    return _combine(items1, items2, Counter.__or__, max)
+
+
+def difference(items1, items2) -> list:
+    """Return a list of the items in items1 that remain after removing the
+    items in items2. Each item occurs max(m - n, 0) times, where m and n are
+    its multiplicities in items1 and items2.
+
+    >>> difference([1, 2, 2, 3], [2, 4])
+    [1, 2, 3]
+    """
+    return _combine(items1, items2, Counter.__sub__,
+                    lambda m, n: max(m - n, 0))
+
+
+def shuffle_tail(elems, n: int, k: int, rng) -> None:
+    """Move k randomly selected items of elems[0:n] (a list or an array) to
+    elems[n - k:n], by running the first k steps of a Fisher-Yates shuffle
+    from the end of the array. Every k-item subset is equally likely to be
+    selected. The items are selected by rng, which can be a random.Random
+    object or the random module.
+
+    >>> import random
+    >>> elems = [1, 2, 3, 4, 5]
+    >>> shuffle_tail(elems, 5, 2, random.Random(2100))
+    >>> sorted(elems)
+    [1, 2, 3, 4, 5]
+    """
+    for last in range(n - 1, n - k - 1, -1):
+        j = rng.randrange(last + 1)
+        elems[j], elems[last] = elems[last], elems[j]
+
+
+def _combine(items1, items2, counter_op, count_op) -> list:
+    """Return the list of items obtained by combining the multiplicities of
+    items1 and items2: with counter_op, if all the items are hashable;
+    otherwise, by applying count_op to the two multiplicities of each
+    distinct item.
+
+    Items are listed in the order in which they first occur in items1, then
+    in items2, with all occurrences of an item together.
+    """
+    try:
+        return list(counter_op(Counter(items1), Counter(items2)).elements())
+    except TypeError:
+        pass
+
+    pairs1 = _pairs(items1)
+    pairs2 = _pairs(items2)
+    distinct = [item for item, _ in pairs1]
+    distinct.extend([item for item, _ in pairs2
+                     if _lookup(pairs1, item) == 0])
+    result = []
+    for item in distinct:
+        n = count_op(_lookup(pairs1, item), _lookup(pairs2, item))
+        result.extend([item] * n)
+    return result
+
+
+def _pairs(items) -> list[list]:
+    """Return a list of [item, multiplicity] pairs for the distinct items in
+    items, found by comparing the items with ==.
+    """
+    pairs = []
+    for item in items:
+        for pair in pairs:
+            if pair[0] == item:
+                pair[1] += 1
+                break
+        else:
+            pairs.append([item, 1])
+    return pairs
+
+
+def _lookup(pairs: list[list], item) -> int:
+    """Return the multiplicity of item in a list returned by _pairs (0 if
+    item isn't in the list).
+    """
+    for x, n in pairs:
+        if x == item:
+            return n
+    return 0